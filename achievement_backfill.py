@@ -0,0 +1,130 @@
+"""
+BeeSmart Spelling App - Achievement Backfill
+Award badges retroactively from stored QuizResult history.
+
+Live badges only come from the in-session accumulator, so students who
+finished quizzes before a badge existed never get it. This job streams the
+results of completed quiz sessions in keyset pages ordered by
+(session_id, id), feeds them through the same accumulator and rules as live
+play (achievements.py), and evaluates each session when its last row has
+gone by. Only one session's accumulator is held at a time, so memory stays
+bounded however many results there are.
+
+Awards are keyed by (user, badge type, earned_in_session) and missing ones
+are bulk-inserted, so re-running the job is a no-op. As in live play, guest
+accounts are skipped.
+
+Run via scripts/backfill_achievements.py.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, not_, select, tuple_
+
+from achievements import BADGES_BY_TYPE, evaluate, new_accumulator, record_answer
+from models import db, Achievement, QuizResult, QuizSession, User
+
+DEFAULT_PAGE_SIZE = 5000
+DEFAULT_INSERT_BATCH = 500
+
+
+def _result_pages(page_size: int):
+    """Yield pages of result rows from completed, non-guest sessions."""
+    last = (0, 0)
+    while True:
+        stmt = (
+            select(QuizResult.id, QuizResult.session_id, QuizResult.user_id, QuizResult.word,
+                   QuizResult.is_correct, QuizResult.time_taken_seconds, QuizResult.hints_used,
+                   QuizSession.session_end)
+            .join(QuizSession, QuizSession.id == QuizResult.session_id)
+            .join(User, User.id == QuizResult.user_id)
+            .where(QuizSession.completed == True,  # noqa: E712
+                   not_(User.username.like('guest_%')),
+                   tuple_(QuizResult.session_id, QuizResult.id) > tuple_(*last))
+            .order_by(QuizResult.session_id, QuizResult.id)
+            .limit(page_size)
+        )
+        rows = db.session.execute(stmt).all()
+        if not rows:
+            return
+        last = (rows[-1].session_id, rows[-1].id)
+        yield rows
+
+
+def _session_awards(rows: Iterable, types: Optional[set]):
+    """(user_id, session_id, session_end, badge) for each badge a session earned."""
+    current, acc, user_id, session_end = None, None, None, None
+    for page in rows:
+        for r in page:
+            if r.session_id != current:
+                if current is not None:
+                    for badge in evaluate(acc):
+                        if types is None or badge['type'] in types:
+                            yield user_id, current, session_end, badge
+                current, acc = r.session_id, new_accumulator()
+                user_id, session_end = r.user_id, r.session_end
+            elapsed_ms = int(float(r.time_taken_seconds) * 1000) if r.time_taken_seconds else 0
+            record_answer(acc, r.word, bool(r.is_correct), elapsed_ms, r.hints_used or 0)
+    if current is not None:
+        for badge in evaluate(acc):
+            if types is None or badge['type'] in types:
+                yield user_id, current, session_end, badge
+
+
+def _missing(pending: List[Dict]) -> List[Dict]:
+    """Drop awards that already exist (same user, type and earned_in_session)."""
+    user_ids = {p['user_id'] for p in pending}
+    types = {p['achievement_type'] for p in pending}
+    existing = set()
+    for user_id, achievement_type, meta in db.session.execute(
+            select(Achievement.user_id, Achievement.achievement_type, Achievement.achievement_metadata)
+            .where(Achievement.user_id.in_(user_ids), Achievement.achievement_type.in_(types))):
+        session_id = (meta or {}).get('earned_in_session')
+        if session_id is not None:
+            existing.add((user_id, achievement_type, int(session_id)))
+    return [p for p in pending
+            if (p['user_id'], p['achievement_type'], p['achievement_metadata']['earned_in_session']) not in existing]
+
+
+def backfill_achievements(badge_types: Optional[Iterable[str]] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                          insert_batch: int = DEFAULT_INSERT_BATCH, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Evaluate badge rules over historical results and insert missing
+    Achievement rows. Must run inside an app context. Returns counts of
+    awards inserted (or, with dry_run, that would be) per badge type.
+    """
+    types = set(badge_types) if badge_types else None
+    unknown = (types or set()) - set(BADGES_BY_TYPE)
+    if unknown:
+        raise ValueError(f"Unknown badge type(s): {', '.join(sorted(unknown))}")
+
+    counts: Dict[str, int] = {}
+    pending: List[Dict] = []
+
+    def flush():
+        rows = _missing(pending)
+        if rows and not dry_run:
+            db.session.execute(insert(Achievement), rows)
+            db.session.commit()
+        for row in rows:
+            counts[row['achievement_type']] = counts.get(row['achievement_type'], 0) + 1
+        pending.clear()
+        print(f"🏆 Backfill: {sum(counts.values())} award(s){' (dry run)' if dry_run else ''}")
+
+    for user_id, session_id, session_end, badge in _session_awards(_result_pages(page_size), types):
+        pending.append({
+            'user_id': user_id,
+            'achievement_type': badge['type'],
+            'achievement_name': badge['name'],
+            'achievement_description': badge['message'],
+            'points_bonus': badge['points'],
+            'earned_date': session_end,
+            'achievement_metadata': {'icon': badge['icon'], 'earned_in_session': session_id, 'backfilled': True},
+        })
+        if len(pending) >= insert_batch:
+            flush()
+    if pending:
+        flush()
+    if dry_run:
+        db.session.rollback()
+    return counts
@@ -0,0 +1,128 @@
+"""
+BeeSmart Spelling App - Achievement Rules
+One registry of quiz badges, evaluated from O(1) incremental accumulators.
+
+Each answer updates a small JSON-able accumulator kept in the quiz state
+(counts, correct-answer time, hints, per-word attempt tallies). Badge rules
+are predicates over that accumulator, so quiz completion no longer rescans
+the answer history and /api/answer no longer scans it for first-attempt
+checks. The same accumulator can be fed from stored QuizResult rows, which
+is how historical backfills evaluate the rules.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class Badge:
+    """A badge's display metadata plus the rule that awards it."""
+
+    def __init__(self, type: str, icon: str, name: str, description: str, rarity: str,
+                 points: int, message: str, rule: Callable[[Dict], bool]):
+        self.type = type
+        self.icon = icon
+        self.name = name
+        self.description = description
+        self.rarity = rarity
+        self.points = points
+        self.message = message
+        self.rule = rule
+
+    def metadata(self) -> Dict:
+        return {'icon': self.icon, 'name': self.name, 'description': self.description,
+                'rarity': self.rarity, 'points': self.points}
+
+    def award(self) -> Dict:
+        return {'type': self.type, 'name': self.name, 'icon': self.icon,
+                'points': self.points, 'message': self.message}
+
+
+def _total(acc: Dict) -> int:
+    return acc['correct'] + acc['incorrect']
+
+
+def _avg_correct_ms(acc: Dict) -> float:
+    return acc['correct_time_ms'] / acc['correct'] if acc['correct'] else 0
+
+
+BADGES: List[Badge] = [
+    # Complete quiz with 100% accuracy, no hints, no wrong attempts
+    Badge('perfect_game', '🌟', 'Perfect Game', '100% accuracy, no hints, no mistakes', 'epic', 500,
+          "PERFECT GAME! You're a spelling champion!",
+          lambda a: _total(a) >= 10 and a['incorrect'] == 0 and a['hints'] == 0),
+    # Average answer time < 10 seconds per word (minimum 10 words)
+    Badge('speed_demon', '⚡', 'Speed Demon', 'Average answer time < 10 seconds', 'rare', 200,
+          "SPEED DEMON! Lightning-fast spelling!",
+          lambda a: a['correct'] >= 10 and 0 < _avg_correct_ms(a) < 10000),
+    # Complete 50+ words in a single session
+    Badge('persistent_learner', '📚', 'Persistent Learner', 'Complete 50+ words in one session', 'rare', 150,
+          "PERSISTENT LEARNER! You love to learn!",
+          lambda a: _total(a) >= 50),
+    # Achieve 10+ correct answers in a row
+    Badge('hot_streak', '🔥', 'Hot Streak', '10+ correct answers in a row', 'common', 100,
+          "HOT STREAK! You're on fire!",
+          lambda a: a['max_streak'] >= 10),
+    # Get correct answer after 2+ wrong attempts on same word
+    Badge('comeback_kid', '🎯', 'Comeback Kid', 'Succeed after multiple wrong attempts', 'rare', 100,
+          "COMEBACK KID! Never give up!",
+          lambda a: a['comeback']),
+    # Use hints wisely (< 20% of words, minimum 10 words)
+    Badge('honey_hunter', '🍯', 'Honey Hunter', 'Use hints wisely (< 20% of words)', 'common', 75,
+          "HONEY HUNTER! Smart use of help!",
+          lambda a: _total(a) >= 10 and a['hints'] > 0 and a['hints'] / _total(a) < 0.2),
+    # Complete quiz quickly (within 5 minutes for 10+ words)
+    Badge('early_bird', '🐝', 'Early Bird', 'Complete quiz in under 5 minutes', 'common', 50,
+          "EARLY BIRD! Quick learner!",
+          lambda a: _total(a) >= 10 and 0 < a['correct_time_ms'] < 5 * 60 * 1000),
+]
+
+BADGES_BY_TYPE = {b.type: b for b in BADGES}
+
+# Display metadata by badge type (template filters, achievement pages)
+BADGE_METADATA = {b.type: b.metadata() for b in BADGES}
+
+
+def new_accumulator() -> Dict:
+    # words: word -> [attempts, wrong, got_correct]
+    return {'correct': 0, 'incorrect': 0, 'streak': 0, 'max_streak': 0, 'hints': 0,
+            'correct_time_ms': 0, 'comeback': False, 'words': {}}
+
+
+def wrong_attempts(acc: Dict, word: str) -> int:
+    """Earlier wrong attempts on `word` (first-attempt bonus check)."""
+    tally = acc['words'].get(word)
+    return tally[1] if tally else 0
+
+
+def record_answer(acc: Dict, word: str, correct: bool, elapsed_ms: int = 0, hints: int = 0) -> Dict:
+    """Fold one answer into the accumulator in place; O(1)."""
+    tally = acc['words'].setdefault(word, [0, 0, False])
+    tally[0] += 1
+    if correct:
+        acc['correct'] += 1
+        acc['streak'] += 1
+        acc['max_streak'] = max(acc['max_streak'], acc['streak'])
+        acc['correct_time_ms'] += elapsed_ms or 0
+        tally[2] = True
+    else:
+        acc['incorrect'] += 1
+        acc['streak'] = 0
+        tally[1] += 1
+    if tally[2] and tally[0] >= 3:
+        acc['comeback'] = True
+    acc['hints'] += hints or 0
+    return acc
+
+
+def accumulator_from_history(history: Iterable[Dict]) -> Dict:
+    """Rebuild an accumulator from quiz-state history entries."""
+    acc = new_accumulator()
+    for h in history:
+        if h.get('word'):
+            record_answer(acc, h['word'], bool(h.get('correct')), h.get('elapsed_ms', 0), h.get('hints', 0))
+    return acc
+
+
+def evaluate(acc: Dict, exclude: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Badges earned by an accumulator, in registry order."""
+    skip = set(exclude or ())
+    return [b.award() for b in BADGES if b.type not in skip and b.rule(acc)]
@@ -0,0 +1,132 @@
+"""
+BeeSmart Spelling App - Answer Event Queue
+Write-behind persistence for per-answer results.
+
+/api/answer used to insert a QuizResult, look up the WordMastery row for
+(user, word), update or insert it and commit, all before responding. On
+Railway Postgres that is several round trips per answer. Instead, answers are
+appended to a local SQLite spool (durable across a crash or restart) and
+acknowledged immediately. A background flusher drains the spool every
+flush_interval_ms, or as soon as max_batch events are waiting, and writes
+each batch in one transaction: QuizResult rows are inserted together and
+WordMastery gets one bulk upsert for the whole batch.
+
+Every event carries the QuizResult uuid, so replaying a batch that was
+committed but not yet removed from the spool is a no-op. When a batch fails
+and the database is reachable, events are retried one by one; an event that
+still fails backs off exponentially and, after MAX_ATTEMPTS, is parked in
+the spool for inspection rather than deleted (see spool.py).
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+from models import db, QuizResult, WordMastery
+from spool import DurableSpool
+
+
+class AnswerQueue(DurableSpool):
+    """Local durable spool of answer events plus a background DB flusher."""
+
+    table = "answer_events"
+    path_env = "ANSWER_SPOOL_PATH"
+    default_filename = "answer_spool.db"
+    thread_name = "bee-answer-flusher"
+    label = "answer event"
+    handled_stat = "flushed"
+
+    def __init__(self, flush_interval_ms: int = 250, max_batch: int = 200):
+        super().__init__(flush_interval_ms, max_batch)
+
+    def init_app(self, app, spool_path: Optional[str] = None):
+        self.interval = int(os.getenv("ANSWER_FLUSH_INTERVAL_MS", self.interval * 1000)) / 1000.0
+        self.max_batch = int(os.getenv("ANSWER_FLUSH_BATCH", self.max_batch))
+        super().init_app(app, spool_path)
+
+    # -- producer side -----------------------------------------------------
+
+    def enqueue(self, **event) -> str:
+        """Spool one answer and return its QuizResult uuid.
+
+        Expected keys: session_id, user_id, word, is_correct, user_answer,
+        input_method, time_taken_seconds, points_earned, hints_used,
+        question_number.
+        """
+        event.setdefault("uuid", str(uuid.uuid4()))
+        event.setdefault("timestamp", datetime.utcnow().isoformat())
+        self._append(event)
+        if self.pending() >= self.max_batch:
+            self._wake.set()
+        return event["uuid"]
+
+    # -- consumer side -----------------------------------------------------
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Write every due spooled event to the database. Returns rows written."""
+        return self.process(now)
+
+    def handle_batch(self, batch) -> Optional[int]:
+        """Write the whole batch in one transaction, falling back to one by one."""
+        try:
+            written = self._write([json.loads(p) for _, p, _ in batch])
+            self._forget([row_id for row_id, _, _ in batch])
+            return written
+        except Exception as e:
+            db.session.rollback()
+            if not self._database_reachable():
+                print(f"⚠️ Database unavailable, keeping {len(batch)} answer(s) spooled: {e}")
+                return None
+            print(f"⚠️ Answer batch of {len(batch)} failed, retrying one by one: {e}")
+            return super().handle_batch(batch)
+
+    def handle(self, event: Dict) -> bool:
+        return self._write([event]) > 0
+
+    def _database_reachable(self) -> bool:
+        try:
+            db.session.execute(select(1))
+            return True
+        except Exception:
+            db.session.rollback()
+            return False
+
+    def _write(self, events: List[Dict]) -> int:
+        """Insert QuizResults and update WordMastery for one batch, one commit."""
+        uuids = [e["uuid"] for e in events]
+        already = set(db.session.execute(select(QuizResult.uuid).where(QuizResult.uuid.in_(uuids))).scalars())
+        fresh = [e for e in events if e["uuid"] not in already]
+        if not fresh:
+            return 0
+
+        for e in fresh:
+            result = QuizResult(
+                uuid=e["uuid"],
+                session_id=e["session_id"],
+                user_id=e["user_id"],
+                word=e["word"],
+                is_correct=e["is_correct"],
+                user_answer=e.get("user_answer"),
+                correct_spelling=e["word"],
+                time_taken_seconds=e.get("time_taken_seconds"),
+                input_method=e.get("input_method"),
+                points_earned=e.get("points_earned", 0),
+                hints_used=e.get("hints_used", 0),
+                question_number=e.get("question_number"),
+                timestamp=datetime.fromisoformat(e["timestamp"]),
+            )
+            result.calculate_difficulty()
+            db.session.add(result)
+
+        WordMastery.record_attempts(
+            (e["user_id"], e["word"], e["is_correct"], e.get("time_taken_seconds")) for e in fresh)
+        db.session.commit()
+        return len(fresh)
+
+
+# Global instance
+answer_queue = AnswerQueue()
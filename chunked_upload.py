@@ -0,0 +1,208 @@
+"""
+BeeSmart Spelling App - Resumable Chunked Uploads
+Spool large photo/PDF uploads to disk in chunks so a dropped connection on
+school Wi-Fi only costs the chunk in flight, not the whole file.
+
+Protocol (see the /api/upload/chunked routes in AjaSpellBApp.py):
+  1. init     -> upload_id + chunk_size
+  2. PUT      -> raw bytes at ?offset=N; the server acknowledges the new total
+  3. status   -> bytes received so far, so a client can resume after a drop
+  4. finalize -> the spooled file is hashed and parsed straight off disk
+Chunks are streamed to a temp file in small blocks, so memory use stays
+bounded regardless of file size. Metadata is kept in a JSON sidecar file so
+uploads survive a process restart.
+
+An upload id belongs to the host whose spool directory holds it: every
+request for it must reach that host (one Railway instance, or sticky
+routing). Worker processes on that host share the spool directory, and each
+upload's .part file is held under an exclusive flock while a chunk is
+written or the upload is finalized, so two workers never interleave writes.
+Without fcntl (Windows dev machines) only threads of one process are
+serialized.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkedUploadError(Exception):
+    """Raised for protocol violations; `status` is the HTTP status to return."""
+
+    def __init__(self, message: str, status: int = 400, received: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.received = received
+
+
+class ChunkedUploadStore:
+    """Disk-backed spool for in-progress chunked uploads."""
+
+    def __init__(self, spool_dir: Optional[str] = None, chunk_size: int = 1024 * 1024,
+                 max_bytes: int = 64 * 1024 * 1024, ttl_seconds: int = 24 * 3600):
+        self.spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "beesmart_uploads")
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    # -- paths / metadata ---------------------------------------------------
+    def _data_path(self, upload_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{upload_id}.json")
+
+    def _load_meta(self, upload_id: str) -> Dict:
+        if not re.fullmatch(r"[0-9a-f]{32}", upload_id or ""):
+            raise ChunkedUploadError("Unknown upload", status=404)
+        try:
+            with open(self._meta_path(upload_id), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            raise ChunkedUploadError("Unknown upload", status=404)
+
+    def _save_meta(self, meta: Dict):
+        tmp = self._meta_path(meta["upload_id"]) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, self._meta_path(meta["upload_id"]))
+
+    def _owned_meta(self, upload_id: str, owner: str) -> Dict:
+        meta = self._load_meta(upload_id)
+        if meta.get("owner") != owner:
+            raise ChunkedUploadError("Unknown upload", status=404)
+        return meta
+
+    @contextmanager
+    def _locked_data(self, upload_id: str):
+        """Open an upload's data file for update, held exclusively across threads and processes."""
+        self._load_meta(upload_id)  # validates the id before touching the filesystem
+        with self._lock:
+            try:
+                fh = open(self._data_path(upload_id), "r+b")
+            except FileNotFoundError:
+                raise ChunkedUploadError("Unknown upload", status=404)
+            with fh:
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                yield fh
+
+    # -- protocol -------------------------------------------------------------
+    def init(self, filename: str, total_size: int, owner: str) -> Dict:
+        """Start an upload of `total_size` bytes and return its metadata."""
+        if total_size <= 0:
+            raise ChunkedUploadError("File size is required")
+        if total_size > self.max_bytes:
+            raise ChunkedUploadError(f"File too large (max {self.max_bytes // (1024 * 1024)}MB)", status=413)
+        self.cleanup_expired()
+
+        meta = {
+            "upload_id": uuid.uuid4().hex,
+            "filename": filename,
+            "size": total_size,
+            "received": 0,
+            "owner": owner,
+            "created_at": time.time(),
+        }
+        with self._lock:
+            open(self._data_path(meta["upload_id"]), "wb").close()
+            self._save_meta(meta)
+        return meta
+
+    def status(self, upload_id: str, owner: str) -> Dict:
+        return self._owned_meta(upload_id, owner)
+
+    def write_chunk(self, upload_id: str, offset: int, stream, owner: str) -> Dict:
+        """Append one chunk read from `stream` at `offset`.
+
+        A chunk at an offset already acknowledged is a retry of a chunk whose
+        ack got lost; it is ignored. A gap returns 409 with the offset to
+        resume from.
+        """
+        with self._locked_data(upload_id) as out:
+            # Re-read under the lock: another worker may have just acknowledged a chunk
+            meta = self._owned_meta(upload_id, owner)
+            received = meta["received"]
+            if offset < received:
+                return meta
+            if offset > received:
+                raise ChunkedUploadError("Chunk offset does not match bytes received", status=409,
+                                         received=received)
+
+            written = 0
+            out.seek(received)
+            out.truncate()
+            while True:
+                block = stream.read(COPY_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > self.chunk_size or received + written > meta["size"]:
+                    out.truncate(received)
+                    raise ChunkedUploadError("Chunk too large", status=413, received=received)
+                out.write(block)
+
+            meta["received"] = received + written
+            self._save_meta(meta)
+            return meta
+
+    def finalize(self, upload_id: str, owner: str) -> Dict:
+        """Check the upload is complete and return its metadata, data path and SHA-256.
+
+        The file is hashed in COPY_BLOCK_SIZE blocks; callers should stream
+        it from `path` rather than read it whole.
+        """
+        with self._locked_data(upload_id) as fh:
+            meta = self._owned_meta(upload_id, owner)
+            if meta["received"] != meta["size"]:
+                raise ChunkedUploadError("Upload incomplete", status=409, received=meta["received"])
+            digest = hashlib.sha256()
+            for block in iter(lambda: fh.read(COPY_BLOCK_SIZE), b""):
+                digest.update(block)
+        meta["path"] = self._data_path(upload_id)
+        meta["sha256"] = digest.hexdigest()
+        return meta
+
+    def discard(self, upload_id: str):
+        for path in (self._data_path(upload_id), self._meta_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def cleanup_expired(self) -> int:
+        """Remove uploads older than the TTL. Returns how many were removed."""
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.spool_dir):
+            if not name.endswith(".json"):
+                continue
+            upload_id = name[:-5]
+            try:
+                meta = self._load_meta(upload_id)
+            except (ChunkedUploadError, ValueError):
+                continue
+            if now - meta.get("created_at", 0) > self.ttl_seconds:
+                self.discard(upload_id)
+                removed += 1
+        return removed
+
+
+# Global instance
+chunked_uploads = ChunkedUploadStore()
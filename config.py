@@ -89,7 +89,9 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # In-memory database
+    # In-memory unless the test run points at a throwaway file (tests/conftest.py)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # no pool pre-ping/recycle for throwaway SQLite
     WTF_CSRF_ENABLED = False
 
 
@@ -0,0 +1,101 @@
+"""
+BeeSmart Spelling App - Default Wordbanks
+Curated demo word lists, parsed once per process and shared by reference.
+
+Every brand-new session (and every crawler) used to re-open and re-parse
+50Words_kidfriendly.txt and store a fresh copy. The curated sets are now
+parsed once at startup, pinned in wordbank_store as frozen tuples, and
+sessions only keep the ref of the set they were given. New sessions get the
+first set that loaded. Only curated sets with definitions belong here: a
+plain word list would show "Practice spelling this word" with no clue.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# (name, file) in preference order; the first set is the classic demo list
+DEFAULT_SETS: Tuple[Tuple[str, str], ...] = (
+    ("kid_friendly_50", "50Words_kidfriendly.txt"),
+)
+MAX_DEFAULT_WORDS = 50
+
+# Sentence given to words listed without a definition
+PLAIN_SENTENCE = "Practice spelling this word: _____"
+
+
+def parse_word_file(file_path: str, limit: int = MAX_DEFAULT_WORDS) -> List[Dict[str, str]]:
+    """Parse a 'word|definition Example: sentence' or plain one-word-per-line file."""
+    words = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            parts = line.split('|')
+            word = parts[0].strip()
+            if len(parts) >= 2:
+                definition_and_example = parts[1].strip()
+
+                # Split definition and example if "Example:" is present
+                if "Example:" in definition_and_example:
+                    definition, sentence = (p.strip() for p in definition_and_example.split("Example:", 1))
+                    definition = definition.rstrip('.')
+                    # Ensure sentence has blank
+                    if "_____" not in sentence:
+                        sentence = f"Definition: {definition}. Fill in the blank: The word is _____."
+                else:
+                    sentence = f"Definition: {definition_and_example}. Fill in the blank: The word is _____."
+            else:
+                # Plain word format
+                sentence = PLAIN_SENTENCE
+
+            words.append({"word": word, "sentence": sentence, "hint": ""})
+            if len(words) >= limit:
+                break
+    return words
+
+
+class DefaultWordbanks:
+    """The curated default sets, pinned in a WordbankStore by name."""
+
+    def __init__(self, sets: Tuple[Tuple[str, str], ...] = DEFAULT_SETS, base_dir: Optional[str] = None):
+        self.sets = sets
+        self.base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+        self._refs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def preload(self, store) -> Dict[str, str]:
+        """Parse every set once and pin it in `store`. Returns name -> ref."""
+        with self._lock:
+            for name, filename in self.sets:
+                if name in self._refs:
+                    continue
+                path = os.path.join(self.base_dir, filename)
+                try:
+                    records = parse_word_file(path)
+                except OSError as e:
+                    print(f"⚠️ Default wordbank {name} not loaded from {path}: {e}")
+                    continue
+                if records:
+                    self._refs[name] = store.pin(records)
+                    print(f"📚 Default wordbank {name}: {len(records)} words pinned")
+            return dict(self._refs)
+
+    def refs(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._refs)
+
+    def current_name(self) -> Optional[str]:
+        """Name of the set new sessions get (the first one loaded)."""
+        return next((name for name, _ in self.sets if name in self._refs), None)
+
+    def current(self) -> Optional[str]:
+        """Ref of the set new sessions get (None if none loaded)."""
+        name = self.current_name()
+        return self._refs.get(name) if name else None
+
+
+# Global instance
+default_wordbanks = DefaultWordbanks()
@@ -0,0 +1,132 @@
+"""
+BeeSmart Spelling App - Guest Account Garbage Collection
+Bulk-delete stale guest users and everything hanging off them.
+
+Guest rows (username 'guest_%') and their quiz data otherwise accumulate
+forever and slow down filter_non_guest_users and every admin aggregate. A
+guest is stale when it was created more than `days` ago and has shown no
+activity since then: no login, quiz session, saved word list, speed round,
+battle seat or session log entry. Guests are selected in keyset-paginated
+batches (id > last_id ORDER BY id LIMIT n). Each batch is removed with one
+set-based DELETE per table, children first, in a single transaction,
+instead of loading ORM objects and cascading row by row.
+
+Run via scripts/gc_guest_accounts.py.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import delete, exists, func, or_, select, update
+
+from models import (db, User, QuizSession, QuizResult, WordMastery, Achievement, SessionLog,
+                    PasswordResetToken, ExportRequest, TeacherStudent, WordList, WordListItem,
+                    SpeedRoundConfig, SpeedRoundScore, SpeedRoundWordResult, SpeedRoundLeaderboardEntry,
+                    BattleSession, BattlePlayer, UserStats)
+
+GUEST_USERNAME_PATTERN = 'guest_%'
+DEFAULT_INACTIVE_DAYS = 30
+DEFAULT_BATCH_SIZE = 500
+
+
+def _recent_activity(cutoff: datetime):
+    """EXISTS clauses for every way a guest can show activity since cutoff."""
+    return [
+        exists().where(QuizSession.user_id == User.id,
+                       or_(QuizSession.session_start >= cutoff, QuizSession.session_end >= cutoff)),
+        exists().where(WordList.created_by_user_id == User.id,
+                       or_(WordList.created_at >= cutoff, WordList.updated_at >= cutoff)),
+        exists().where(SpeedRoundScore.user_id == User.id, SpeedRoundScore.completed_at >= cutoff),
+        exists().where(BattlePlayer.user_id == User.id, BattlePlayer.joined_at >= cutoff),
+        exists().where(SessionLog.user_id == User.id, SessionLog.timestamp >= cutoff),
+    ]
+
+
+def _stale_guest_ids(cutoff: datetime, after_id: int, limit: int) -> List[int]:
+    stmt = (
+        select(User.id)
+        .where(User.id > after_id,
+               User.username.like(GUEST_USERNAME_PATTERN),
+               User.created_at < cutoff,
+               or_(User.last_login.is_(None), User.last_login < cutoff),
+               ~or_(*_recent_activity(cutoff)))
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return list(db.session.execute(stmt).scalars())
+
+
+def _plan(ids: List[int]):
+    """(table name, statement) pairs for one batch, children before parents.
+
+    Shared records a guest merely touched (battles it created, speed-round
+    configs, battle seats) are kept and detached instead of deleted.
+    """
+    guest_lists = select(WordList.id).where(WordList.created_by_user_id.in_(ids))
+    return [
+        ('quiz_results', delete(QuizResult).where(QuizResult.user_id.in_(ids))),
+        ('quiz_sessions', delete(QuizSession).where(QuizSession.user_id.in_(ids))),
+        ('word_mastery', delete(WordMastery).where(WordMastery.user_id.in_(ids))),
+        ('user_stats', delete(UserStats).where(UserStats.user_id.in_(ids))),
+        ('achievements', delete(Achievement).where(Achievement.user_id.in_(ids))),
+        ('session_logs', delete(SessionLog).where(SessionLog.user_id.in_(ids))),
+        ('password_reset_tokens', delete(PasswordResetToken).where(PasswordResetToken.user_id.in_(ids))),
+        ('export_requests', delete(ExportRequest).where(
+            or_(ExportRequest.requested_by_user_id.in_(ids), ExportRequest.target_user_id.in_(ids)))),
+        ('teacher_students', delete(TeacherStudent).where(
+            or_(TeacherStudent.student_id.in_(ids), TeacherStudent.teacher_user_id.in_(ids)))),
+        ('speed_round_leaderboard', delete(SpeedRoundLeaderboardEntry).where(
+            SpeedRoundLeaderboardEntry.user_id.in_(ids))),
+        ('speed_round_word_results', delete(SpeedRoundWordResult).where(SpeedRoundWordResult.user_id.in_(ids))),
+        ('speed_round_scores', delete(SpeedRoundScore).where(SpeedRoundScore.user_id.in_(ids))),
+        ('word_list_items', delete(WordListItem).where(WordListItem.word_list_id.in_(guest_lists))),
+        ('word_lists', delete(WordList).where(WordList.created_by_user_id.in_(ids))),
+        ('battle_players', update(BattlePlayer).where(BattlePlayer.user_id.in_(ids)).values(user_id=None)),
+        ('battle_sessions', update(BattleSession).where(BattleSession.created_by.in_(ids)).values(created_by=None)),
+        ('speed_round_configs', update(SpeedRoundConfig).where(SpeedRoundConfig.created_by.in_(ids)).values(created_by=None)),
+        ('users', delete(User).where(User.id.in_(ids))),
+    ]
+
+
+def _count(stmt) -> int:
+    """Rows a planned DELETE/UPDATE would touch, for dry runs."""
+    table = stmt.table
+    return db.session.execute(
+        select(func.count()).select_from(table).where(stmt.whereclause)
+    ).scalar() or 0
+
+
+def collect_stale_guests(days: int = DEFAULT_INACTIVE_DAYS, batch_size: int = DEFAULT_BATCH_SIZE,
+                         dry_run: bool = False, max_batches: int = None) -> Dict[str, int]:
+    """
+    Delete guests inactive for `days` and their data. Must run inside an app
+    context. Returns rows reclaimed (or, with dry_run, that would be) per
+    table, plus 'batches'.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    totals: Dict[str, int] = {}
+    last_id = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        ids = _stale_guest_ids(cutoff, last_id, batch_size)
+        if not ids:
+            break
+        last_id = ids[-1]
+        batches += 1
+        try:
+            for name, stmt in _plan(ids):
+                rows = _count(stmt) if dry_run else db.session.execute(stmt).rowcount
+                totals[name] = totals.get(name, 0) + (rows or 0)
+            if dry_run:
+                db.session.rollback()
+            else:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        print(f"🧹 Guest GC batch {batches}: {len(ids)} guest(s) through id {last_id}"
+              f"{' (dry run)' if dry_run else ''}")
+
+    totals['batches'] = batches
+    return totals
@@ -0,0 +1,228 @@
+"""
+BeeSmart Spelling App - Identity Cache
+Short-TTL per-process cache of the user fields most requests need.
+
+Flask-Login's load_user ran a primary-key query for every request, and quiz
+pages then called get_avatar_data(), which queried Avatar again. During a
+quiz burst that is dozens of identical lookups per student per minute.
+load_user now returns a CachedIdentity built from a cached snapshot of the
+immutable identity fields plus the rendered avatar data. Any other attribute
+(points, stats, relationships, methods) and every write attaches the real
+ORM User on first use, so existing `current_user.x = ...` code keeps working.
+
+Entries expire after ttl_seconds and are invalidated explicitly when a flush
+changes one of the snapshot fields on a User or changes the Avatar catalog.
+Invalidation is per process: a role change, deactivation (is_active) or
+deletion made in one gunicorn worker reaches the others only when their
+entry expires, i.e. after up to ttl_seconds. If the row turns out to be gone
+when the ORM User is needed, the request is logged out and gets a 401.
+
+TeacherKeyCache does the same for the student -> teacher_key link stamped on
+every new QuizSession, invalidated whenever a TeacherStudent row changes.
+Only existing links are cached: invalidation is per process, so a cached
+"no teacher" would keep other workers stamping sessions with None after a
+teacher links the student. Unlinked students cost one indexed query.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from flask import abort, has_request_context
+from flask_login import UserMixin, logout_user
+from sqlalchemy import event, inspect as sa_inspect
+
+from models import db, User, Avatar, TeacherStudent
+
+# Fields safe to serve from the cache: they only change through profile,
+# avatar or role edits, all of which invalidate the entry
+IDENTITY_FIELDS = (
+    "id", "uuid", "username", "display_name", "email", "role", "teacher_key",
+    "is_active", "grade_level", "school_name", "avatar_id", "avatar_variant", "avatar_locked",
+)
+
+
+class CachedIdentity(UserMixin):
+    """Read-only identity snapshot standing in for current_user."""
+
+    def __init__(self, fields: Dict, avatar: Optional[Dict], user: Optional[User] = None):
+        object.__setattr__(self, "_fields", dict(fields))
+        object.__setattr__(self, "_avatar", avatar)
+        object.__setattr__(self, "_user", user)
+
+    @property
+    def is_active(self):
+        return bool(self._fields.get("is_active", True))
+
+    def orm(self) -> Optional[User]:
+        """The real User row, loaded (once per request) when it's needed."""
+        user = object.__getattribute__(self, "_user")
+        if user is None:
+            user_id = object.__getattribute__(self, "_fields")["id"]
+            user = db.session.get(User, user_id)
+            if user is None:
+                # Deleted since the identity was cached (e.g. by another worker)
+                identity_cache.invalidate(user_id)
+                if has_request_context():
+                    logout_user()
+                    abort(401)
+                raise LookupError(f"user {user_id} no longer exists")
+            object.__setattr__(self, "_user", user)
+        return user
+
+    def get_avatar_data(self):
+        if self._avatar is None:
+            return self.orm().get_avatar_data()
+        return copy.deepcopy(self._avatar)
+
+    def __getattr__(self, name):
+        fields = object.__getattribute__(self, "_fields")
+        if name in fields:
+            return fields[name]
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.orm(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.orm(), name, value)
+        if name in self._fields:
+            self._fields[name] = value
+
+    def __eq__(self, other):
+        other_id = getattr(other, "id", None)
+        return other_id is not None and other_id == self._fields.get("id")
+
+    def __hash__(self):
+        return hash(("user", self._fields.get("id")))
+
+    def __repr__(self):
+        return f"<CachedIdentity {self._fields.get('username')} ({self._fields.get('role')})>"
+
+
+class IdentityCache:
+    """user_id -> (identity fields, avatar data), TTL + LRU, thread-safe."""
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, Dict, Optional[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, user_id: int) -> Optional[CachedIdentity]:
+        """Identity for Flask-Login's user_loader; one query per miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return CachedIdentity(entry[1], entry[2])
+            self.misses += 1
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            self.invalidate(user_id)
+            return None
+        fields = {f: getattr(user, f) for f in IDENTITY_FIELDS}
+        try:
+            avatar = user.get_avatar_data()
+        except Exception as e:
+            print(f"⚠️ Identity cache: avatar lookup failed for user {user_id}: {e}")
+            avatar = None
+        with self._lock:
+            self._entries[user_id] = (now + self.ttl_seconds, fields, avatar)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return CachedIdentity(fields, avatar, user=user)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class TeacherKeyCache:
+    """student_id -> active teacher_key, TTL + LRU, thread-safe. Misses (no
+    active link) are not cached."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, student_id: int) -> Optional[str]:
+        """teacher_key of the student's active link; one query per miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(student_id)
+                return entry[1]
+
+        teacher_key = db.session.query(TeacherStudent.teacher_key).filter_by(
+            student_id=student_id, is_active=True).limit(1).scalar()
+        if teacher_key is None:
+            return None
+        with self._lock:
+            self._entries[student_id] = (now + self.ttl_seconds, teacher_key)
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return teacher_key
+
+    def invalidate(self, student_id: int):
+        with self._lock:
+            self._entries.pop(student_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instances
+identity_cache = IdentityCache()
+teacher_key_cache = TeacherKeyCache()
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = sa_inspect(target)
+    if any(state.attrs[f].history.has_changes() for f in IDENTITY_FIELDS):
+        identity_cache.invalidate(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    identity_cache.invalidate(target.id)
+
+
+@event.listens_for(Avatar, "after_insert")
+@event.listens_for(Avatar, "after_update")
+@event.listens_for(Avatar, "after_delete")
+def _avatar_catalog_changed(mapper, connection, target):
+    # Rendered avatar data depends on the catalog row; drop everything
+    identity_cache.clear()
+
+
+@event.listens_for(TeacherStudent, "after_insert")
+@event.listens_for(TeacherStudent, "after_update")
+@event.listens_for(TeacherStudent, "after_delete")
+def _teacher_link_changed(mapper, connection, target):
+    teacher_key_cache.invalidate(target.student_id)
+    # A link re-pointed to another student leaves the old one stale too
+    old = sa_inspect(target).attrs.student_id.history.deleted
+    for student_id in old or ():
+        teacher_key_cache.invalidate(student_id)
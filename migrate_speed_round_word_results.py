@@ -0,0 +1,64 @@
+"""
+Database Migration: Normalize speed-round word details
+Creates speed_round_word_results and backfills it from the word_details JSON
+stored on existing speed_round_scores, in keyset-paginated chunks with one
+bulk insert and commit per chunk. Scores that already have rows are skipped,
+so the migration can be stopped and re-run safely.
+
+Usage: python migrate_speed_round_word_results.py [--batch-size 500] [--dry-run]
+"""
+import argparse
+
+from sqlalchemy import exists, insert, select
+
+from models import db, SpeedRoundScore, SpeedRoundWordResult
+
+
+def migrate_speed_round_word_results(batch_size=500, dry_run=False):
+    """Backfill word rows for every score missing them. Returns (scores, rows)."""
+    SpeedRoundWordResult.__table__.create(bind=db.engine, checkfirst=True)
+    has_rows = exists().where(SpeedRoundWordResult.score_id == SpeedRoundScore.id)
+    last_id = 0
+    scores = rows = 0
+
+    while True:
+        chunk = db.session.execute(
+            select(SpeedRoundScore.id, SpeedRoundScore.user_id, SpeedRoundScore.word_details,
+                   SpeedRoundScore.difficulty_level, SpeedRoundScore.completed_at)
+            .where(SpeedRoundScore.id > last_id, ~has_rows)
+            .order_by(SpeedRoundScore.id)
+            .limit(batch_size)
+        ).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        mappings = []
+        for score in chunk:
+            mappings.extend(SpeedRoundWordResult.rows_for(
+                score.id, score.user_id, score.word_details, score.difficulty_level, score.completed_at))
+        if mappings and not dry_run:
+            db.session.execute(insert(SpeedRoundWordResult), mappings)
+            db.session.commit()
+        else:
+            db.session.rollback()
+        scores += len(chunk)
+        rows += len(mappings)
+        print(f"✅ Through score {last_id}: {scores} score(s), {rows} word row(s){' (dry run)' if dry_run else ''}")
+
+    return scores, rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="scores per chunk")
+    parser.add_argument("--dry-run", action="store_true", help="count rows without inserting")
+    args = parser.parse_args()
+
+    from AjaSpellBApp import app
+    with app.app_context():
+        print("=" * 80)
+        print("DATABASE MIGRATION: speed_round_word_results")
+        print("=" * 80)
+        scores, rows = migrate_speed_round_word_results(args.batch_size, args.dry_run)
+        print(f"\n💾 {'Would insert' if args.dry_run else 'Inserted'} {rows} word row(s) for {scores} score(s)")
@@ -190,62 +190,142 @@ class User(UserMixin, db.Model):
     
     def update_gpa_and_accuracy(self):
         """
-        Calculate and update cumulative GPA and average accuracy from all completed quizzes.
+        Recalculate cumulative GPA and average accuracy from all completed quizzes.
         GPA Scale: A+ = 4.0, A = 4.0, A- = 3.7, B+ = 3.3, B = 3.0, B- = 2.7, 
                    C+ = 2.3, C = 2.0, C- = 1.7, D+ = 1.3, D = 1.0, D- = 0.7, F = 0.0
+
+        Full history scan: used for backfill and repair. Quiz completion uses
+        record_completed_session(), which is O(1).
         """
         completed_sessions = QuizSession.query.filter_by(
             user_id=self.id,
             completed=True
-        ).all()
-        
-        if not completed_sessions:
+        ).order_by(QuizSession.id).all()
+
+        stats = UserStats.for_user(self.id)
+        stats.reset()
+        for session in completed_sessions:
+            stats.add_session(session)
+        self.apply_stats(stats)
+
+    def record_completed_session(self, quiz_session):
+        """Fold one newly completed session into the running aggregates"""
+        if not UserStats.fold_in(self.id, quiz_session):
+            # First completion since aggregates were introduced: build from history
+            self.update_gpa_and_accuracy()
+            return
+        self.apply_stats(db.session.get(UserStats, self.id, populate_existing=True))
+
+    def apply_stats(self, stats):
+        """Copy aggregates into the denormalized columns the UI reads"""
+        if stats.graded_sessions:
+            self.cumulative_gpa = round(float(stats.gpa_points_total) / stats.graded_sessions, 2)
+            self.average_accuracy = round(float(stats.accuracy_total) / stats.graded_sessions, 2)
+            if stats.best_grade:
+                self.best_grade = stats.best_grade
+        elif not stats.completed_sessions:
             self.cumulative_gpa = 0.0
             self.average_accuracy = 0.0
-            return
-        
-        # Grade to GPA mapping
-        grade_to_gpa = {
-            'A+': 4.0, 'A': 4.0, 'A-': 3.7,
-            'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-            'C+': 2.3, 'C': 2.0, 'C-': 1.7,
-            'D+': 1.3, 'D': 1.0, 'D-': 0.7,
-            'F': 0.0
-        }
-        
-        total_gpa_points = 0
-        total_accuracy = 0
-        valid_sessions = 0
-        best_gpa = 0.0
-        
-        for session in completed_sessions:
-            if session.grade:
-                gpa_value = grade_to_gpa.get(session.grade, 0.0)
-                total_gpa_points += gpa_value
-                valid_sessions += 1
-                
-                # Track best grade
-                if gpa_value > best_gpa:
-                    best_gpa = gpa_value
-                    self.best_grade = session.grade
-            
-            if session.accuracy_percentage:
-                total_accuracy += float(session.accuracy_percentage)
-        
-        # Calculate averages
-        if valid_sessions > 0:
-            self.cumulative_gpa = round(total_gpa_points / valid_sessions, 2)
-            self.average_accuracy = round(total_accuracy / valid_sessions, 2)
-        
-        # Update best streak
-        session_streaks = [s.max_streak for s in completed_sessions if s.max_streak]
-        if session_streaks:
-            self.best_streak = max(session_streaks)
+        if stats.best_streak:
+            self.best_streak = max(self.best_streak or 0, stats.best_streak)
     
     def __repr__(self):
         return f'<User {self.username} ({self.role})>'
 
 
+# Letter grade -> GPA points
+GRADE_TO_GPA = {
+    'A+': 4.0, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0
+}
+
+
+class UserStats(db.Model):
+    """Running GPA/accuracy aggregates per user, updated once per completed quiz"""
+    __tablename__ = 'user_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    completed_sessions = db.Column(db.Integer, nullable=False, default=0)
+    graded_sessions = db.Column(db.Integer, nullable=False, default=0)
+    gpa_points_total = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    accuracy_total = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # summed over all completed sessions
+    best_gpa = db.Column(db.Numeric(3, 2))
+    best_grade = db.Column(db.String(5))
+    best_streak = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def for_user(cls, user_id, create=True):
+        """Stats row for a user (created empty if missing and create=True)"""
+        stats = db.session.get(cls, user_id)
+        if stats is None and create:
+            stats = cls(user_id=user_id)
+            stats.reset()
+            db.session.add(stats)
+        return stats
+
+    def reset(self):
+        self.completed_sessions = 0
+        self.graded_sessions = 0
+        self.gpa_points_total = 0
+        self.accuracy_total = 0
+        self.best_gpa = None
+        self.best_grade = None
+        self.best_streak = 0
+
+    def add_session(self, session):
+        """Fold one completed QuizSession into the aggregates (full rebuilds)"""
+        self.completed_sessions += 1
+        if session.grade:
+            gpa_value = GRADE_TO_GPA.get(session.grade, 0.0)
+            self.graded_sessions += 1
+            self.gpa_points_total = float(self.gpa_points_total) + gpa_value
+            # Track best grade (first to beat the best GPA so far wins ties; an F never counts)
+            if gpa_value > float(self.best_gpa or 0):
+                self.best_gpa = gpa_value
+                self.best_grade = session.grade
+        if session.accuracy_percentage:
+            self.accuracy_total = float(self.accuracy_total) + float(session.accuracy_percentage)
+        if session.max_streak and session.max_streak > self.best_streak:
+            self.best_streak = session.max_streak
+
+    @classmethod
+    def fold_in(cls, user_id, session):
+        """
+        Add one completed QuizSession to the user's row with a single UPDATE,
+        so concurrent completions can't overwrite each other's increments.
+        Same rules as add_session(). Caller commits. Returns False if the
+        user has no stats row yet.
+        """
+        values = {
+            'completed_sessions': cls.completed_sessions + 1,
+            'updated_at': datetime.utcnow(),
+        }
+        if session.grade:
+            gpa_value = GRADE_TO_GPA.get(session.grade, 0.0)
+            improves = db.func.coalesce(cls.best_gpa, 0) < gpa_value
+            values.update({
+                'graded_sessions': cls.graded_sessions + 1,
+                'gpa_points_total': cls.gpa_points_total + gpa_value,
+                'best_gpa': db.case((improves, gpa_value), else_=cls.best_gpa),
+                'best_grade': db.case((improves, session.grade), else_=cls.best_grade),
+            })
+        if session.accuracy_percentage:
+            values['accuracy_total'] = cls.accuracy_total + float(session.accuracy_percentage)
+        if session.max_streak:
+            values['best_streak'] = db.case((cls.best_streak < session.max_streak, session.max_streak),
+                                            else_=cls.best_streak)
+        stmt = (db.update(cls).where(cls.user_id == user_id).values(values)
+                .execution_options(synchronize_session=False))
+        return db.session.execute(stmt).rowcount > 0
+
+    def __repr__(self):
+        return f'<UserStats user={self.user_id} sessions={self.completed_sessions}>'
+
+
 class QuizSession(db.Model):
     """Quiz session tracking - one record per quiz attempt"""
     __tablename__ = 'quiz_sessions'
@@ -413,6 +493,11 @@ class WordMastery(db.Model):
     needs_review = db.Column(db.Boolean, default=False, index=True)
     
     __table_args__ = (db.UniqueConstraint('user_id', 'word', name='unique_user_word'),)
+
+    # (minimum success rate, level), highest first; anything lower is 'learning'
+    MASTERY_THRESHOLDS = ((95, 'mastered'), (80, 'proficient'), (50, 'practicing'))
+    # Words below this success rate are flagged for review
+    REVIEW_BELOW = 70
     
     def update_stats(self, is_correct, time_taken=None):
         """Update mastery stats after attempt"""
@@ -427,19 +512,8 @@ class WordMastery(db.Model):
         self.success_rate = round((self.times_correct / self.times_seen) * 100, 2)
         
         # Update mastery level
-        if self.success_rate >= 95:
-            self.mastery_level = 'mastered'
-            self.needs_review = False
-        elif self.success_rate >= 80:
-            self.mastery_level = 'proficient'
-            self.needs_review = False
-        elif self.success_rate >= 50:
-            self.mastery_level = 'practicing'
-            self.needs_review = self.success_rate < 70
-        else:
-            self.mastery_level = 'learning'
-            self.needs_review = True
-        
+        self.mastery_level, self.needs_review = self.mastery_for(self.success_rate)
+
         # Update timing stats
         if time_taken:
             if self.average_time_seconds:
@@ -454,6 +528,130 @@ class WordMastery(db.Model):
         
         self.last_attempt_date = datetime.utcnow()
     
+    @staticmethod
+    def mastery_for(success_rate):
+        """(mastery_level, needs_review) for a success rate"""
+        needs_review = success_rate < WordMastery.REVIEW_BELOW
+        for minimum, level in WordMastery.MASTERY_THRESHOLDS:
+            if success_rate >= minimum:
+                return level, needs_review
+        return 'learning', needs_review
+
+    @classmethod
+    def record_attempts(cls, attempts):
+        """
+        Fold many attempts into word_mastery with one INSERT ... ON CONFLICT
+        DO UPDATE, computing counters, success rate, mastery level and timing
+        in SQL so concurrent answers can't race on unique_user_word.
+
+        attempts: iterable of (user_id, word, is_correct, time_taken_seconds).
+        Caller commits. Returns the number of (user, word) rows touched.
+        """
+        folded = {}
+        for user_id, word, is_correct, time_taken in attempts:
+            f = folded.setdefault((user_id, word), {'seen': 0, 'correct': 0, 'times': []})
+            f['seen'] += 1
+            f['correct'] += 1 if is_correct else 0
+            if time_taken:
+                f['times'].append(float(time_taken))
+        if not folded:
+            return 0
+
+        now = datetime.utcnow()
+        rows = []
+        for (user_id, word), f in folded.items():
+            rate = round(f['correct'] / f['seen'] * 100, 2)
+            level, review = cls.mastery_for(rate)
+            rows.append({
+                'user_id': user_id, 'word': word,
+                'times_seen': f['seen'], 'times_correct': f['correct'],
+                'times_incorrect': f['seen'] - f['correct'],
+                'success_rate': rate, 'mastery_level': level, 'needs_review': review,
+                'first_attempt_date': now, 'last_attempt_date': now,
+                'average_time_seconds': round(sum(f['times']) / len(f['times']), 2) if f['times'] else None,
+                'fastest_time_seconds': min(f['times']) if f['times'] else None,
+            })
+
+        stmt = cls.upsert_statement(rows, db.session.get_bind().dialect.name)
+        if stmt is None:
+            return cls._record_attempts_orm(rows)
+        db.session.execute(stmt)
+        return len(rows)
+
+    @classmethod
+    def upsert_statement(cls, rows, dialect):
+        """INSERT ... ON CONFLICT DO UPDATE for postgresql/sqlite, else None"""
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return None
+
+        t = cls.__table__
+        stmt = insert(t).values(rows)
+        new = stmt.excluded
+        seen = t.c.times_seen + new.times_seen
+        correct = t.c.times_correct + new.times_correct
+        # literal_column keeps 100.0 a numeric constant on Postgres (round(numeric, int))
+        rate = db.func.round(correct * db.literal_column('100.0') / seen, 2)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.user_id, t.c.word],
+            set_={
+                'times_seen': seen,
+                'times_correct': correct,
+                'times_incorrect': t.c.times_incorrect + new.times_incorrect,
+                'success_rate': rate,
+                # Same thresholds as mastery_for
+                'mastery_level': db.case(
+                    *((rate >= minimum, level) for minimum, level in cls.MASTERY_THRESHOLDS),
+                    else_='learning'),
+                'needs_review': rate < cls.REVIEW_BELOW,
+                # Running average weighted by attempts, as update_stats does
+                'average_time_seconds': db.case(
+                    (new.average_time_seconds.is_(None), t.c.average_time_seconds),
+                    (t.c.average_time_seconds.is_(None), new.average_time_seconds),
+                    else_=db.func.round(
+                        (t.c.average_time_seconds * t.c.times_seen
+                         + new.average_time_seconds * new.times_seen) / seen, 2)),
+                'fastest_time_seconds': db.case(
+                    (new.fastest_time_seconds.is_(None), t.c.fastest_time_seconds),
+                    (t.c.fastest_time_seconds.is_(None), new.fastest_time_seconds),
+                    (new.fastest_time_seconds < t.c.fastest_time_seconds, new.fastest_time_seconds),
+                    else_=t.c.fastest_time_seconds),
+                'last_attempt_date': new.last_attempt_date,
+            },
+        )
+        return stmt
+
+    @classmethod
+    def _record_attempts_orm(cls, rows):
+        """Read-modify-write fallback for dialects without ON CONFLICT"""
+        for row in rows:
+            existing = cls.query.filter_by(user_id=row['user_id'], word=row['word']).first()
+            if existing is None:
+                db.session.add(cls(**row))
+                continue
+            seen = existing.times_seen + row['times_seen']
+            if row['average_time_seconds'] is not None:
+                if existing.average_time_seconds is None:
+                    existing.average_time_seconds = row['average_time_seconds']
+                else:
+                    existing.average_time_seconds = round(
+                        (float(existing.average_time_seconds) * existing.times_seen
+                         + row['average_time_seconds'] * row['times_seen']) / seen, 2)
+            if row['fastest_time_seconds'] is not None and (
+                    existing.fastest_time_seconds is None
+                    or row['fastest_time_seconds'] < float(existing.fastest_time_seconds)):
+                existing.fastest_time_seconds = row['fastest_time_seconds']
+            existing.times_seen = seen
+            existing.times_correct += row['times_correct']
+            existing.times_incorrect += row['times_incorrect']
+            existing.success_rate = round(existing.times_correct / seen * 100, 2)
+            existing.mastery_level, existing.needs_review = cls.mastery_for(existing.success_rate)
+            existing.last_attempt_date = row['last_attempt_date']
+        return len(rows)
+
     def __repr__(self):
         return f'<WordMastery {self.word} - {self.mastery_level} ({self.success_rate}%)>'
 
@@ -665,6 +863,11 @@ class SpeedRoundScore(db.Model):
     # Relationships
     user = db.relationship('User', backref='speed_round_scores')
     
+    __table_args__ = (
+        # Leaderboard rebuilds and per-difficulty time-window queries
+        db.Index('ix_speed_round_scores_board', 'difficulty_level', 'completed_at', 'honey_points_earned'),
+    )
+    
     @property
     def accuracy_percentage(self):
         """Calculate accuracy as percentage"""
@@ -676,6 +879,89 @@ class SpeedRoundScore(db.Model):
         return f'<SpeedRoundScore user_id={self.user_id} score={self.honey_points_earned}>'
 
 
+class SpeedRoundWordResult(db.Model):
+    """One row per word of a completed speed round (normalized word_details)"""
+    __tablename__ = 'speed_round_word_results'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    score_id = db.Column(db.Integer, db.ForeignKey('speed_round_scores.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # 1-based order within the round
+    word = db.Column(db.String(100), nullable=False, index=True)
+    user_answer = db.Column(db.String(100))
+    is_correct = db.Column(db.Boolean, nullable=False, default=False)
+    skipped = db.Column(db.Boolean, default=False)
+    time_taken = db.Column(db.Float)  # seconds
+    points_earned = db.Column(db.Integer, default=0)
+    speed_bonus = db.Column(db.Boolean, default=False)
+    difficulty_level = db.Column(db.String(50))
+    completed_at = db.Column(db.DateTime, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_speed_round_word_results_user_completed', 'user_id', 'completed_at'),
+    )
+    
+    @staticmethod
+    def rows_for(score_id, user_id, word_details, difficulty_level, completed_at):
+        """Insert mappings for a round's word_details JSON (bulk insert input)."""
+        rows = []
+        for position, d in enumerate(word_details or [], start=1):
+            if not isinstance(d, dict) or not d.get('word'):
+                continue
+            rows.append({
+                'score_id': score_id,
+                'user_id': user_id,
+                'position': position,
+                'word': str(d['word'])[:100],
+                'user_answer': (d.get('user_answer') or '')[:100],
+                'is_correct': bool(d.get('correct')),
+                'skipped': bool(d.get('skipped')),
+                'time_taken': d.get('time_taken'),
+                'points_earned': d.get('points_earned') or 0,
+                'speed_bonus': bool(d.get('speed_bonus')),
+                'difficulty_level': difficulty_level,
+                'completed_at': completed_at,
+            })
+        return rows
+    
+    def __repr__(self):
+        return f'<SpeedRoundWordResult {self.word} correct={self.is_correct} score={self.score_id}>'
+
+
+class SpeedRoundLeaderboardEntry(db.Model):
+    """A player's best speed-round score on one leaderboard (period x difficulty)"""
+    __tablename__ = 'speed_round_leaderboard'
+    
+    period = db.Column(db.String(10), primary_key=True)  # daily, weekly, all_time
+    period_key = db.Column(db.String(10), primary_key=True)  # 2026-10-19, 2026-W42, all
+    difficulty_level = db.Column(db.String(50), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    best_points = db.Column(db.Integer, nullable=False, default=0)
+    score_id = db.Column(db.Integer, db.ForeignKey('speed_round_scores.id'))
+    achieved_at = db.Column(db.DateTime, nullable=False)
+    
+    __table_args__ = (
+        # Top-K is a backwards range scan and "my rank" a range count on this index
+        db.Index('ix_speed_round_leaderboard_rank', 'period', 'period_key', 'difficulty_level', 'best_points'),
+    )
+    
+    def __repr__(self):
+        return f'<SpeedRoundLeaderboardEntry {self.period}/{self.period_key}/{self.difficulty_level} user={self.user_id} {self.best_points}>'
+
+
+class OutboxReceipt(db.Model):
+    """Idempotency keys of outbox events already applied (see score_outbox.py)"""
+    __tablename__ = 'outbox_receipts'
+    
+    key = db.Column(db.String(36), primary_key=True)  # event uuid
+    kind = db.Column(db.String(50), nullable=False)
+    result_id = db.Column(db.Integer)  # e.g. the SpeedRoundScore id
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<OutboxReceipt {self.kind} {self.key[:8]} -> {self.result_id}>'
+
+
 def init_db(app):
     """Initialize database with Flask app"""
     db.init_app(app)
@@ -883,3 +1169,29 @@ class Avatar(db.Model):
     
     def __repr__(self):
         return f'<Avatar {self.slug} - {self.name}>'
+
+
+class ServerSession(db.Model):
+    """Server-side Flask session payloads (the cookie only carries the signed id)"""
+    __tablename__ = 'server_sessions'
+    
+    sid = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ServerSession {self.sid[:8]}... expires {self.expires_at}>'
+
+
+class SharedWordbank(db.Model):
+    """Immutable wordbank contents keyed by a hash of the normalized records"""
+    __tablename__ = 'shared_wordbanks'
+    
+    ref = db.Column(db.String(64), primary_key=True)  # sha256 hex of canonical JSON
+    records = db.Column(db.JSON, nullable=False)
+    word_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # bumped on put/get; drives retention
+    
+    def __repr__(self):
+        return f'<SharedWordbank {self.ref[:12]} ({self.word_count} words)>'
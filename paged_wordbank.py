@@ -0,0 +1,201 @@
+"""
+BeeSmart Spelling App - Paged Wordbanks
+Read-only, database-backed wordbanks for large word lists.
+
+District curriculum lists run to thousands of words, far too many to keep in
+the session. Large uploads are bulk-inserted as WordList/WordListItem rows and
+the session keeps only the list id; PagedWordbank then behaves like a list of
+word dicts while loading fixed-size pages on demand through a small
+process-wide LRU.
+
+Cached pages are keyed by the list's version (its updated_at, read once per
+request by list_version), so when a list's items are replaced in one worker
+the other workers stop serving the old pages on their next request instead
+of grading answers against the wrong word. invalidate_word_list only frees
+this process's memory early.
+"""
+
+import math
+import random
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from models import db, WordList, WordListItem
+
+PAGE_SIZE = 100
+MAX_CACHED_PAGES = 64
+
+_PAGE_CACHE: "OrderedDict[Tuple[int, Hashable, int], Tuple[Dict[str, str], ...]]" = OrderedDict()
+_PAGE_CACHE_LOCK = threading.Lock()
+
+
+def list_version(word_list_id: int) -> Optional[str]:
+    """The list's current version (updated_at), or None if it no longer exists."""
+    updated_at = db.session.execute(
+        select(WordList.updated_at).where(WordList.id == word_list_id)
+    ).scalar()
+    return updated_at.isoformat() if updated_at else None
+
+
+def _load_page(word_list_id: int, version: Hashable, page_no: int, page_size: int) -> Tuple[Dict[str, str], ...]:
+    """Fetch one page of items (positions are 1-based and contiguous)."""
+    key = (word_list_id, version, page_no)
+    with _PAGE_CACHE_LOCK:
+        page = _PAGE_CACHE.get(key)
+        if page is not None:
+            _PAGE_CACHE.move_to_end(key)
+            return page
+
+    first = page_no * page_size + 1
+    items = (
+        WordListItem.query
+        .filter(
+            WordListItem.word_list_id == word_list_id,
+            WordListItem.position >= first,
+            WordListItem.position < first + page_size,
+        )
+        .order_by(WordListItem.position.asc())
+        .all()
+    )
+    page = tuple(
+        {"word": it.word, "sentence": it.sentence or "", "hint": it.hint or ""}
+        for it in items
+    )
+
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[key] = page
+        while len(_PAGE_CACHE) > MAX_CACHED_PAGES:
+            _PAGE_CACHE.popitem(last=False)
+    return page
+
+
+def invalidate_word_list(word_list_id: int):
+    """Drop cached pages for a list whose items were replaced or deleted."""
+    with _PAGE_CACHE_LOCK:
+        for key in [k for k in _PAGE_CACHE if k[0] == word_list_id]:
+            del _PAGE_CACHE[key]
+
+
+class PagedWordbank(Sequence):
+    """List-like view over one version of a saved word list that loads items page by page."""
+
+    paged = True
+
+    def __init__(self, word_list_id: int, count: int, page_size: int = PAGE_SIZE,
+                 version: Optional[Hashable] = None):
+        self.word_list_id = word_list_id
+        self.count = count
+        self.page_size = page_size
+        self.version = version
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("wordbank index out of range")
+        page = _load_page(self.word_list_id, self.version, index // self.page_size, self.page_size)
+        offset = index % self.page_size
+        if offset >= len(page):
+            raise IndexError(f"word list {self.word_list_id} is missing position {index + 1}")
+        return page[offset]
+
+    def __iter__(self):
+        for page_no in range(math.ceil(self.count / self.page_size)):
+            yield from _load_page(self.word_list_id, self.version, page_no, self.page_size)
+
+    def __repr__(self):
+        return f"<PagedWordbank list={self.word_list_id} ({self.count} words)>"
+
+
+FEISTEL_ROUNDS = 4
+
+
+def _round_function(value: int, key: int, round_no: int) -> int:
+    """32-bit integer hash of one Feistel half, keyed per round."""
+    h = (value * 0x9E3779B1 + key + round_no * 0x85EBCA77) & 0xFFFFFFFF
+    h ^= h >> 15
+    h = (h * 0x2C1B3C6D) & 0xFFFFFFFF
+    return h ^ (h >> 12)
+
+
+class AffineOrder(Sequence):
+    """Compact shuffled order for large quizzes: position i maps to (a*mix(i) + b) mod n.
+
+    mix is a keyed permutation of range(n) (a small Feistel network,
+    cycle-walked back into range) and the affine step with gcd(a, n) == 1 is
+    another, so the quiz state stores four integers instead of an n-element
+    order list. Without mix, consecutive positions would step through the
+    list in an arithmetic progression (b, b+a, b+2a, ...), which is easy to
+    spot. States saved before the key existed (no "k") keep that plain order.
+    """
+
+    def __init__(self, n: int, a: int, b: int, k: Optional[int] = None):
+        self.n = n
+        self.a = a
+        self.b = b
+        self.k = k
+        bits = max(2, (n - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._mask = (1 << self._half) - 1
+
+    @classmethod
+    def random(cls, n: int) -> "AffineOrder":
+        k = random.getrandbits(32)
+        if n <= 1:
+            return cls(n, 1, 0, k)
+        a = random.randrange(1, n)
+        while math.gcd(a, n) != 1:
+            a = random.randrange(1, n)
+        return cls(n, a, random.randrange(n), k)
+
+    @classmethod
+    def from_state(cls, data: Dict[str, int]) -> "AffineOrder":
+        k = data.get("k")
+        return cls(int(data["n"]), int(data["a"]), int(data["b"]), int(k) if k is not None else None)
+
+    def to_state(self) -> Dict[str, int]:
+        state = {"n": self.n, "a": self.a, "b": self.b}
+        if self.k is not None:
+            state["k"] = self.k
+        return state
+
+    def _mix(self, index: int) -> int:
+        if self.k is None:
+            return index
+        x = index
+        while True:
+            # Feistel rounds permute [0, 4**half); walking the cycle until the
+            # value lands below n keeps it a permutation of range(n)
+            left, right = x >> self._half, x & self._mask
+            for round_no in range(FEISTEL_ROUNDS):
+                left, right = right, left ^ (_round_function(right, self.k, round_no) & self._mask)
+            x = (left << self._half) | right
+            if x < self.n:
+                return x
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("quiz order index out of range")
+        return (self.a * self._mix(index) + self.b) % self.n
+
+
+def sample_words(wordbank, count: int) -> List[Dict[str, str]]:
+    """Random sample of up to `count` records without materializing a paged list."""
+    indices = random.sample(range(len(wordbank)), min(count, len(wordbank)))
+    return [wordbank[i] for i in indices]
@@ -0,0 +1,117 @@
+"""
+BeeSmart Spelling App - Speed Round Score Outbox
+Durable, write-behind persistence for completed speed rounds.
+
+/api/speed-round/complete used to insert the score and bump the student's
+lifetime points inside the request, retrying with time.sleep() backoff and
+finally returning None, which lost the score. Completed rounds are now
+appended to a local SQLite outbox (durable across a crash or restart) and
+acknowledged immediately. A background drainer applies each one to the main
+database in a single transaction: the SpeedRoundScore row, its per-word
+SpeedRoundWordResult rows (one bulk insert), the player's leaderboard
+entries, the lifetime points and an OutboxReceipt keyed by the event uuid. The receipt makes
+replays no-ops. Failed events back off exponentially per event, off the
+request path. After MAX_ATTEMPTS an event is parked (kept, not deleted) for
+inspection (see spool.py).
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, insert, update
+
+from models import db, OutboxReceipt, SpeedRoundScore, SpeedRoundWordResult, User
+from spool import DurableSpool
+import speed_round_leaderboard
+
+SPEED_ROUND_SCORE = "speed_round_score"
+
+
+class ScoreOutbox(DurableSpool):
+    """Local durable outbox of score events plus a background drainer."""
+
+    table = "outbox_events"
+    path_env = "SCORE_OUTBOX_PATH"
+    default_filename = "score_outbox.db"
+    thread_name = "bee-score-outbox"
+    label = "score outbox event"
+    handled_stat = "applied"
+
+    def __init__(self, poll_interval_ms: int = 500, max_batch: int = 50):
+        super().__init__(poll_interval_ms, max_batch)
+
+    # -- producer side -----------------------------------------------------
+
+    def enqueue_speed_round(self, user_id: int, score_data: Dict) -> str:
+        """Spool a completed speed round and return its idempotency key.
+
+        score_data holds the SpeedRoundScore fields (words_attempted,
+        words_correct, total_time, honey_points_earned, ...); its
+        honey_points_earned are also added to the user's lifetime points.
+        """
+        event = {
+            "key": str(uuid.uuid4()),
+            "kind": SPEED_ROUND_SCORE,
+            "user_id": user_id,
+            "score": score_data,
+            "completed_at": datetime.utcnow().isoformat(),
+        }
+        self._append(event)
+        self._wake.set()
+        return event["key"]
+
+    # -- consumer side -----------------------------------------------------
+
+    def drain(self, now: Optional[float] = None) -> int:
+        """Apply every due event. Returns events applied."""
+        return self.process(now)
+
+    def handle(self, event: Dict) -> bool:
+        return self._apply(event)
+
+    def _apply(self, event: Dict) -> bool:
+        """Apply one event in one transaction; False if it was already applied."""
+        if db.session.get(OutboxReceipt, event["key"]) is not None:
+            return False
+        if event["kind"] != SPEED_ROUND_SCORE:
+            raise ValueError(f"Unknown outbox event kind: {event['kind']}")
+
+        data = event["score"]
+        score = SpeedRoundScore(
+            user_id=event["user_id"],
+            words_attempted=data.get("words_attempted", 0),
+            words_correct=data.get("words_correct", 0),
+            total_time=data.get("total_time", 0),
+            honey_points_earned=data.get("honey_points_earned", 0),
+            longest_streak=data.get("longest_streak", 0),
+            average_time_per_word=data.get("average_time_per_word", 0),
+            fastest_word_time=data.get("fastest_word_time"),
+            speed_bonuses_earned=data.get("speed_bonuses_earned", 0),
+            word_details=data.get("word_details", []),
+            difficulty_level=data.get("difficulty_level", "unknown"),
+            completed_at=datetime.fromisoformat(event["completed_at"]),
+        )
+        db.session.add(score)
+        db.session.flush()
+        word_rows = SpeedRoundWordResult.rows_for(score.id, score.user_id, score.word_details,
+                                                  score.difficulty_level, score.completed_at)
+        if word_rows:
+            db.session.execute(insert(SpeedRoundWordResult), word_rows)
+        improved = speed_round_leaderboard.record_score(score)
+
+        points = int(data.get("honey_points_earned") or 0)
+        if points:
+            db.session.execute(
+                update(User).where(User.id == event["user_id"])
+                .values(total_lifetime_points=func.coalesce(User.total_lifetime_points, 0) + points)
+            )
+        db.session.add(OutboxReceipt(key=event["key"], kind=event["kind"], result_id=score.id))
+        db.session.commit()
+        if improved:
+            speed_round_leaderboard.leaderboard_cache.invalidate(score.difficulty_level)
+        return True
+
+
+# Global instance
+score_outbox = ScoreOutbox()
@@ -0,0 +1,36 @@
+"""Award badges retroactively by replaying stored quiz results through the
+current badge rules. Safe to re-run: existing awards are skipped.
+
+Usage: python scripts/backfill_achievements.py [--badge hot_streak ...] [--dry-run]
+                                              [--page-size 5000] [--insert-batch 500]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AjaSpellBApp import app
+from achievement_backfill import backfill_achievements, DEFAULT_PAGE_SIZE, DEFAULT_INSERT_BATCH
+from achievements import BADGES_BY_TYPE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--badge", action="append", choices=sorted(BADGES_BY_TYPE),
+                        help="only award this badge type (repeatable; default all)")
+    parser.add_argument("--dry-run", action="store_true", help="count awards without inserting")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="quiz results read per query")
+    parser.add_argument("--insert-batch", type=int, default=DEFAULT_INSERT_BATCH, help="awards inserted per commit")
+    args = parser.parse_args()
+
+    with app.app_context():
+        counts = backfill_achievements(args.badge, page_size=args.page_size,
+                                       insert_batch=args.insert_batch, dry_run=args.dry_run)
+    verb = "Would award" if args.dry_run else "Awarded"
+    for badge_type, n in sorted(counts.items()):
+        print(f"  {badge_type}: {n}")
+    print(f"\n{verb} {sum(counts.values())} badge(s)")
+
+
+if __name__ == "__main__":
+    main()
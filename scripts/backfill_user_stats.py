@@ -0,0 +1,79 @@
+"""Backfill the user_stats GPA/accuracy aggregates from quiz history, or check
+that stored aggregates still match a full recomputation.
+
+Usage: python scripts/backfill_user_stats.py [--check] [--batch-size 200]
+"""
+import argparse
+import os
+import sys
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AjaSpellBApp import app
+from models import db, User, UserStats, QuizSession
+
+FIELDS = ("completed_sessions", "graded_sessions", "gpa_points_total", "accuracy_total", "best_grade", "best_streak")
+
+
+def _user_batches(batch_size):
+    """Users that have completed quizzes, keyset-paginated by id."""
+    last_id = 0
+    while True:
+        ids = [row[0] for row in db.session.query(User.id)
+               .filter(User.id > last_id,
+                       User.quiz_sessions.any(QuizSession.completed == True))
+               .order_by(User.id).limit(batch_size)]
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield User.query.filter(User.id.in_(ids)).order_by(User.id).all()
+
+
+def _snapshot(stats):
+    if stats is None:
+        return None
+    values = (getattr(stats, f) for f in FIELDS)
+    return tuple(round(float(v), 2) if isinstance(v, (int, float, Decimal)) else v for v in values)
+
+
+def backfill(batch_size):
+    total = 0
+    for users in _user_batches(batch_size):
+        for user in users:
+            user.update_gpa_and_accuracy()
+        db.session.commit()
+        total += len(users)
+        print(f"✅ Rebuilt stats for {total} user(s)")
+    return total
+
+
+def check(batch_size):
+    checked = mismatched = 0
+    for users in _user_batches(batch_size):
+        for user in users:
+            stored = _snapshot(UserStats.for_user(user.id, create=False))
+            user.update_gpa_and_accuracy()
+            expected = _snapshot(UserStats.for_user(user.id))
+            checked += 1
+            if stored != expected:
+                mismatched += 1
+                print(f"❌ {user.username} (id {user.id}): stored={stored} expected={expected}")
+        db.session.rollback()  # check only; never write
+    print(f"\nChecked {checked} user(s), {mismatched} mismatch(es)")
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="report mismatches without writing")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.check:
+            sys.exit(1 if check(args.batch_size) else 0)
+        backfill(args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
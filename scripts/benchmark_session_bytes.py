@@ -0,0 +1,76 @@
+"""Measure session overhead per quiz step: cookie bytes sent with each request
+and Set-Cookie bytes returned, for the signed-cookie session versus the
+server-side store.
+
+Usage: python scripts/benchmark_session_bytes.py [--words 50] [--steps 20]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AjaSpellBApp import app, db
+from models import ServerSession
+from server_session import configure_session_backend
+
+WORDS = ["garden", "pencil", "rocket", "button", "planet", "window", "basket", "candle",
+         "forest", "ladder", "marble", "pocket", "rabbit", "saddle", "tunnel", "violin"]
+
+
+def _wordlist(n):
+    return [{"word": f"{WORDS[i % len(WORDS)]}{'s' * (i // len(WORDS))}",
+             "sentence": f"Fill in the blank: The _____ number {i} is on the table.", "hint": ""}
+            for i in range(n)]
+
+
+def _step_bytes(client, method, url, **kwargs):
+    cookie = client.get_cookie(app.config["SESSION_COOKIE_NAME"])
+    sent = len(cookie.value) if cookie else 0
+    resp = getattr(client, method)(url, **kwargs)
+    set_cookie = sum(len(v) for k, v in resp.headers.items() if k.lower() == "set-cookie")
+    return sent, set_cookie, resp
+
+
+def run(backend, words, steps):
+    installed = configure_session_backend(app, backend, db=db, model=ServerSession)
+    rows = []
+    with app.test_client() as client:
+        sent, recv, _ = _step_bytes(client, "post", "/api/upload", json={"words": _wordlist(words)})
+        rows.append(("upload", sent, recv))
+        for i in range(steps):
+            sent, recv, resp = _step_bytes(client, "post", "/api/next")
+            rows.append((f"next #{i + 1}", sent, recv))
+            data = resp.get_json() or {}
+            if data.get("done"):
+                break
+            sent, recv, _ = _step_bytes(client, "post", "/api/answer",
+                                        json={"user_input": "guess", "method": "keyboard", "elapsed_ms": 1500})
+            rows.append((f"answer #{i + 1}", sent, recv))
+    return installed, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+
+    results = {}
+    for backend in ("cookie", "sql"):
+        installed, rows = run(backend, args.words, args.steps)
+        results[installed] = rows
+        total_sent = sum(r[1] for r in rows)
+        total_recv = sum(r[2] for r in rows)
+        print(f"\n=== {installed} session ({args.words} words) ===")
+        print(f"{'step':<14}{'cookie sent':>14}{'set-cookie':>14}")
+        for name, sent, recv in rows:
+            print(f"{name:<14}{sent:>14}{recv:>14}")
+        print(f"{'total':<14}{total_sent:>14}{total_recv:>14}")
+        print(f"{'avg / step':<14}{total_sent // len(rows):>14}{total_recv // len(rows):>14}")
+
+
+if __name__ == "__main__":
+    main()
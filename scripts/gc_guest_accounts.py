@@ -0,0 +1,35 @@
+"""Delete guest accounts inactive for N days, with their quiz sessions,
+results, word mastery and other per-user rows, in keyset-paginated batches.
+
+Usage: python scripts/gc_guest_accounts.py [--days 30] [--batch-size 500] [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AjaSpellBApp import app
+from guest_gc import DEFAULT_BATCH_SIZE, DEFAULT_INACTIVE_DAYS, collect_stale_guests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=DEFAULT_INACTIVE_DAYS,
+                        help="delete guests with no quiz activity for this many days")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="count rows without deleting")
+    args = parser.parse_args()
+
+    with app.app_context():
+        totals = collect_stale_guests(days=args.days, batch_size=args.batch_size,
+                                      dry_run=args.dry_run, max_batches=args.max_batches)
+
+    verb = "would be reclaimed" if args.dry_run else "reclaimed"
+    print(f"\n=== Rows {verb} ({totals.pop('batches')} batch(es)) ===")
+    for table, rows in totals.items():
+        print(f"{table:<24}{rows:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Rebuild the current speed-round leaderboards (today, this week, all time)
+from speed_round_scores and/or prune daily and weekly boards past their
+retention window.
+
+Usage: python scripts/rebuild_speed_round_leaderboards.py [--difficulty grade_3_4 ...]
+                                                         [--batch-size 1000] [--prune-only]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AjaSpellBApp import app, run_schema_migrations
+import speed_round_leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000, help="scores per chunk")
+    parser.add_argument("--difficulty", action="append", dest="difficulties",
+                        help="only rebuild this difficulty's boards (repeatable; default all)")
+    parser.add_argument("--prune-only", action="store_true", help="only drop expired daily/weekly boards")
+    args = parser.parse_args()
+
+    run_schema_migrations()
+    with app.app_context():
+        if not args.prune_only:
+            folded = speed_round_leaderboard.rebuild(batch_size=args.batch_size,
+                                                     difficulties=args.difficulties)
+            print(f"🏆 Rebuilt leaderboards from {folded} score(s)")
+        removed = speed_round_leaderboard.prune()
+        print(f"🧹 Pruned {removed} expired leaderboard row(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+BeeSmart Spelling App - Server-Side Sessions
+Keep wordbanks and quiz state on the server; the cookie only holds a signed id.
+
+Flask's default session serializes and signs the whole wordbank and quiz
+history into Set-Cookie on every response, which breaks browser cookie limits
+and inflates every request. This module provides a SessionInterface with
+pluggable stores:
+  - SQLSessionStore:    `server_sessions` table (SQLite locally, Postgres on Railway)
+  - RedisSessionStore:  Redis with native key expiry
+  - MemorySessionStore: in-process stand-in for Redis (tests / single worker)
+Entries expire after PERMANENT_SESSION_LIFETIME; the SQL store deletes
+expired rows at most every PURGE_INTERVAL_SECONDS per process. Call
+rotate_session_id() on login so a pre-login id can't be fixed on a victim.
+"""
+
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin, SecureCookieSessionInterface
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+# Re-save an unmodified session only when its expiry has slid this far, so a
+# read-only request doesn't cost a write just to refresh the TTL
+TOUCH_INTERVAL_SECONDS = 3600
+
+# How often (per process) the SQL store sweeps expired rows on save
+PURGE_INTERVAL_SECONDS = 300
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session dict that tracks modification and knows its server-side id."""
+
+    def __init__(self, initial=None, sid: Optional[str] = None, new: bool = False,
+                 expires_at: Optional[float] = None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.previous_sid: Optional[str] = None
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+        self.accessed = False
+
+
+class MemorySessionStore:
+    """In-process store with TTL; stands in for Redis when none is configured."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, sid: str) -> Tuple[Optional[bytes], Optional[float]]:
+        with self._lock:
+            entry = self._data.get(sid)
+            if entry is None:
+                return None, None
+            if entry[1] <= time.time():
+                del self._data[sid]
+                return None, None
+            return entry
+
+    def save(self, sid: str, payload: bytes, ttl_seconds: int):
+        with self._lock:
+            self._data[sid] = (payload, time.time() + ttl_seconds)
+            if random.random() < 0.01:
+                self._purge_expired()
+
+    def delete(self, sid: str):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def _purge_expired(self):
+        now = time.time()
+        for sid in [s for s, (_, exp) in self._data.items() if exp <= now]:
+            del self._data[sid]
+
+
+class RedisSessionStore:
+    """Redis-backed store; expiry is handled by Redis itself."""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "beesmart:session:"):
+        self.client = client
+        self.prefix = prefix
+
+    def load(self, sid: str) -> Tuple[Optional[bytes], Optional[float]]:
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.ttl(self.prefix + sid)
+        payload, ttl = pipe.execute()
+        if payload is None:
+            return None, None
+        return payload, time.time() + max(int(ttl or 0), 0)
+
+    def save(self, sid: str, payload: bytes, ttl_seconds: int):
+        self.client.setex(self.prefix + sid, ttl_seconds, payload)
+
+    def delete(self, sid: str):
+        self.client.delete(self.prefix + sid)
+
+
+class SQLSessionStore:
+    """Table-backed store using Core statements on its own connection, so a
+    failed ORM transaction in the request can't block saving the session."""
+
+    name = "sql"
+
+    def __init__(self, db, model, purge_interval_seconds: float = PURGE_INTERVAL_SECONDS):
+        self.db = db
+        self.table = model.__table__
+        self.purge_interval = purge_interval_seconds
+        self._purge_lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def load(self, sid: str) -> Tuple[Optional[bytes], Optional[float]]:
+        t = self.table
+        with self.db.engine.connect() as conn:
+            row = conn.execute(
+                t.select().with_only_columns(t.c.data, t.c.expires_at).where(t.c.sid == sid)
+            ).first()
+        if row is None or row.expires_at <= datetime.utcnow():
+            return None, None
+        return bytes(row.data), row.expires_at.replace(tzinfo=timezone.utc).timestamp()
+
+    def save(self, sid: str, payload: bytes, ttl_seconds: int):
+        t = self.table
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        with self.db.engine.begin() as conn:
+            updated = conn.execute(
+                t.update().where(t.c.sid == sid).values(data=payload, expires_at=expires_at)
+            ).rowcount
+            if not updated:
+                conn.execute(t.insert().values(sid=sid, data=payload, expires_at=expires_at))
+        self._maybe_purge()
+
+    def _maybe_purge(self):
+        with self._purge_lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        try:
+            self.purge_expired()
+        except Exception as e:
+            print(f"⚠️ Session purge failed ({self.name}): {e}")
+
+    def purge_expired(self) -> int:
+        """Delete every expired session row. Returns rows removed."""
+        t = self.table
+        with self.db.engine.begin() as conn:
+            return conn.execute(t.delete().where(t.c.expires_at <= datetime.utcnow())).rowcount or 0
+
+    def delete(self, sid: str):
+        t = self.table
+        with self.db.engine.begin() as conn:
+            conn.execute(t.delete().where(t.c.sid == sid))
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Stores session payloads in a store; the cookie carries only a signed id."""
+
+    serializer = TaggedJSONSerializer()
+    salt = "beesmart-server-session"
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app) -> Optional[Signer]:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    def _ttl_seconds(self, app) -> int:
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def open_session(self, app, request):
+        signer = self._signer(app)
+        if signer is None:
+            return None
+        signed = request.cookies.get(self.get_cookie_name(app))
+        if signed:
+            try:
+                sid = signer.unsign(signed).decode("utf-8")
+            except BadSignature:
+                sid = None
+            if sid:
+                try:
+                    payload, expires_at = self.store.load(sid)
+                except Exception as e:
+                    print(f"⚠️ Session store load failed ({self.store.name}): {e}")
+                    payload, expires_at = None, None
+                if payload is not None:
+                    try:
+                        data = self.serializer.loads(payload.decode("utf-8"))
+                        return ServerSideSession(data, sid=sid, expires_at=expires_at)
+                    except Exception:
+                        pass
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                try:
+                    self.store.delete(session.sid)
+                except Exception as e:
+                    print(f"⚠️ Session store delete failed ({self.store.name}): {e}")
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if session.new and not session.modified:
+            # Nothing but what the app stamps on every visitor: no row, no cookie
+            # for crawlers and one-off hits (see mark_untouched)
+            return
+
+        if session.previous_sid:
+            try:
+                self.store.delete(session.previous_sid)
+            except Exception as e:
+                print(f"⚠️ Session store delete failed ({self.store.name}): {e}")
+            session.previous_sid = None
+
+        ttl = self._ttl_seconds(app)
+        stale = session.expires_at is not None and session.expires_at - time.time() < ttl - TOUCH_INTERVAL_SECONDS
+        if session.modified or stale:
+            payload = self.serializer.dumps(dict(session)).encode("utf-8")
+            try:
+                self.store.save(session.sid, payload, ttl)
+            except Exception as e:
+                print(f"⚠️ Session store save failed ({self.store.name}): {e}")
+                return
+
+        if not (session.modified or self.should_set_cookie(app, session)):
+            return
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid.encode("utf-8")).decode("utf-8"),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def rotate_session_id(session):
+    """Give a server-side session a fresh id, keeping its data; the old id is
+    deleted from the store when the response is saved. No-op for cookie sessions."""
+    if isinstance(session, ServerSideSession):
+        if not session.new and session.previous_sid is None:
+            session.previous_sid = session.sid
+        session.sid = secrets.token_urlsafe(32)
+        session.modified = True
+
+
+def mark_untouched(session):
+    """Treat a brand-new server-side session as unmodified after the app has
+    stamped bookkeeping keys on it, so it is only stored once a request puts
+    real data in it. No-op for cookie sessions and existing sessions."""
+    if isinstance(session, ServerSideSession) and session.new:
+        session.modified = False
+
+
+def configure_session_backend(app, backend: str, db=None, model=None, redis_client=None) -> str:
+    """Install the session interface for `backend` ("sql", "redis", "memory" or
+    "cookie"). When Redis is requested but no client is available this falls
+    back to the shared SQL store (warning), since a per-process memory store
+    would lose sessions between workers. Returns the backend actually installed."""
+    backend = (backend or "").lower()
+    if backend == "cookie":
+        app.session_interface = SecureCookieSessionInterface()
+        return "cookie"
+    if backend == "redis" and redis_client is None:
+        print("⚠️ SESSION_BACKEND=redis but no Redis client is connected; falling back to sql")
+        backend = "sql"
+    if backend == "redis":
+        store = RedisSessionStore(redis_client)
+    elif backend == "sql" and db is not None and model is not None:
+        store = SQLSessionStore(db, model)
+    else:
+        store = MemorySessionStore()
+    app.session_interface = ServerSideSessionInterface(store)
+    return store.name
@@ -0,0 +1,238 @@
+"""
+BeeSmart Spelling App - Speed Round Leaderboards
+Daily, weekly and all-time speed-round leaderboards per difficulty level.
+
+Ranking straight off speed_round_scores means grouping every score in the
+window by player on each request. Instead each player's best score per board
+(period x period key x difficulty) is materialized in speed_round_leaderboard
+and refreshed incrementally by the score outbox, in the same transaction that
+inserts the score. Board reads then ride ix_speed_round_leaderboard_rank:
+
+- top-K is a backwards range scan of K index entries,
+- "my rank" is a primary-key lookup plus an index range count of the players
+  with a higher best (competition ranking: ties share a rank).
+
+The rank count is O(log n + rank), not O(log n): B-tree indexes keep no
+subtree counts, so the database still walks the entries above the player.
+That is a handful of pages for anyone near the top and one board's worth
+(players per difficulty per period, not scores) at worst, which is far
+cheaper than aggregating speed_round_scores, and it stays exact.
+
+Top-K responses and board sizes are cached per process for
+CACHE_TTL_SECONDS and dropped as soon as a new score lands on that
+difficulty. The player's own entry and rank count are never cached.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_, select
+
+from models import db, SpeedRoundLeaderboardEntry, SpeedRoundScore, User
+
+DAILY = "daily"
+WEEKLY = "weekly"
+ALL_TIME = "all_time"
+PERIODS = (DAILY, WEEKLY, ALL_TIME)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+CACHE_TTL_SECONDS = 15
+
+def period_key(period: str, when: datetime) -> str:
+    """Board key for a UTC timestamp: 2026-10-19, 2026-W42 or 'all'."""
+    if period == DAILY:
+        return when.strftime("%Y-%m-%d")
+    if period == WEEKLY:
+        year, week, _ = when.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == ALL_TIME:
+        return "all"
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+def record_score(score: SpeedRoundScore, periods: Iterable[str] = PERIODS) -> int:
+    """Fold one flushed score into its boards without committing.
+
+    Returns how many boards it improved (new entry or new personal best).
+    """
+    points = int(score.honey_points_earned or 0)
+    improved = 0
+    for period in periods:
+        pk = (period, period_key(period, score.completed_at), score.difficulty_level, score.user_id)
+        entry = db.session.get(SpeedRoundLeaderboardEntry, pk)
+        if entry is None:
+            db.session.add(SpeedRoundLeaderboardEntry(
+                period=pk[0], period_key=pk[1], difficulty_level=pk[2], user_id=pk[3],
+                best_points=points, score_id=score.id, achieved_at=score.completed_at))
+        elif points > entry.best_points:
+            entry.best_points = points
+            entry.score_id = score.id
+            entry.achieved_at = score.completed_at
+        else:
+            continue
+        improved += 1
+    return improved
+
+
+def _board(period: str, difficulty: str, now: Optional[datetime]):
+    key = period_key(period, now or datetime.utcnow())
+    return (SpeedRoundLeaderboardEntry.period == period,
+            SpeedRoundLeaderboardEntry.period_key == key,
+            SpeedRoundLeaderboardEntry.difficulty_level == difficulty)
+
+
+def top(period: str, difficulty: str, limit: int = DEFAULT_LIMIT, now: Optional[datetime] = None) -> List[Dict]:
+    """The best `limit` players on a board, highest first (uncached)."""
+    E = SpeedRoundLeaderboardEntry
+    rows = db.session.execute(
+        select(E.user_id, E.best_points, E.achieved_at, User.display_name, User.username)
+        .join(User, User.id == E.user_id)
+        .where(*_board(period, difficulty, now))
+        .order_by(E.best_points.desc(), E.achieved_at, E.user_id)
+        .limit(limit)
+    ).all()
+
+    entries = []
+    for position, row in enumerate(rows):
+        # Competition ranking: a tie keeps the rank of the first player on it
+        tied = entries and entries[-1]["points"] == row.best_points
+        entries.append({
+            "rank": entries[-1]["rank"] if tied else position + 1,
+            "user_id": row.user_id,
+            "name": row.display_name or row.username,
+            "points": row.best_points,
+            "achieved_at": row.achieved_at.isoformat() if row.achieved_at else None,
+        })
+    return entries
+
+
+def rank_of(user_id: int, period: str, difficulty: str, now: Optional[datetime] = None) -> Optional[Dict]:
+    """A player's rank and best on a board, or None if they have no score there."""
+    E = SpeedRoundLeaderboardEntry
+    key = period_key(period, now or datetime.utcnow())
+    entry = db.session.get(E, (period, key, difficulty, user_id))
+    if entry is None:
+        return None
+    board = _board(period, difficulty, now)
+    ahead = db.session.execute(
+        select(func.count()).select_from(E).where(*board, E.best_points > entry.best_points)
+    ).scalar() or 0
+    players = leaderboard_cache.get(
+        (difficulty, period, key, "players"),
+        lambda: db.session.execute(select(func.count()).select_from(E).where(*board)).scalar() or 0)
+    return {"rank": ahead + 1, "points": entry.best_points, "players": players}
+
+
+class LeaderboardCache:
+    """Per-process TTL cache of rendered top-K boards, invalidated per difficulty."""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.ttl = ttl_seconds
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """Cached value for key (difficulty first), loading it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > now:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, difficulty: Optional[str] = None):
+        """Drop every cached board for a difficulty (or everything)."""
+        with self._lock:
+            if difficulty is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == difficulty]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+leaderboard_cache = LeaderboardCache()
+
+
+def cached_top(period: str, difficulty: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    """top() through the response cache; the key includes the current period key."""
+    key = (difficulty, period, period_key(period, datetime.utcnow()), limit)
+    return leaderboard_cache.get(key, lambda: top(period, difficulty, limit))
+
+
+def rebuild(batch_size: int = 1000, now: Optional[datetime] = None,
+            difficulties: Optional[Iterable[str]] = None) -> int:
+    """Recompute the current boards from speed_round_scores. Returns scores folded in.
+
+    Only today's daily board, this week's weekly board and the all-time board
+    are replaced (for `difficulties`, default all); earlier daily and weekly
+    boards are left for prune() to expire. All-time boards take every score,
+    the current daily and weekly boards only the scores from their window.
+    """
+    E = SpeedRoundLeaderboardEntry
+    now = now or datetime.utcnow()
+    difficulties = list(difficulties) if difficulties is not None else None
+
+    current = or_(*(and_(E.period == period, E.period_key == period_key(period, now)) for period in PERIODS))
+    wipe = E.__table__.delete().where(current)
+    scores = select(SpeedRoundScore).order_by(SpeedRoundScore.id).limit(batch_size)
+    if difficulties is not None:
+        wipe = wipe.where(E.difficulty_level.in_(difficulties))
+        scores = scores.where(SpeedRoundScore.difficulty_level.in_(difficulties))
+    db.session.execute(wipe)
+
+    week_start = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+    last_id = 0
+    folded = 0
+
+    while True:
+        chunk = db.session.execute(scores.where(SpeedRoundScore.id > last_id)).scalars().all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        for score in chunk:
+            if score.user_id is None or score.completed_at is None:
+                continue
+            periods = [ALL_TIME]
+            if score.completed_at >= week_start:
+                periods.append(WEEKLY)
+                if period_key(DAILY, score.completed_at) == period_key(DAILY, now):
+                    periods.append(DAILY)
+            record_score(score, periods)
+            folded += 1
+        db.session.commit()
+        db.session.expunge_all()
+
+    for difficulty in difficulties if difficulties is not None else [None]:
+        leaderboard_cache.invalidate(difficulty)
+    return folded
+
+
+def prune(now: Optional[datetime] = None, keep_days: int = 14, keep_weeks: int = 8) -> int:
+    """Delete daily/weekly boards older than the retention window. Returns rows removed."""
+    E = SpeedRoundLeaderboardEntry
+    now = now or datetime.utcnow()
+    oldest_day = period_key(DAILY, now - timedelta(days=keep_days))
+    oldest_week = period_key(WEEKLY, now - timedelta(weeks=keep_weeks))
+    removed = 0
+    for period, oldest in ((DAILY, oldest_day), (WEEKLY, oldest_week)):
+        # Keys are zero-padded, so string order is chronological order
+        removed += db.session.execute(
+            E.__table__.delete().where(E.period == period, E.period_key < oldest)
+        ).rowcount or 0
+    db.session.commit()
+    return removed
@@ -0,0 +1,195 @@
+"""
+BeeSmart Spelling App - Durable Event Spool
+Local SQLite spool with a background worker, shared by answer_queue and
+score_outbox.
+
+Events are appended to a table in a local SQLite file (durable across a crash
+or restart) and a daemon thread hands them to the subclass's handler every
+interval, or sooner when woken. An event whose handler raises backs off
+exponentially and, after MAX_ATTEMPTS, is parked in the spool for inspection
+rather than deleted.
+
+Subclasses set `table`, `path_env`, `default_filename`, `thread_name` and
+`label`, and implement handle(event); handle_batch() can be overridden to
+write several events in one transaction.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from models import db
+
+# Retry schedule for events that fail on their own: BASE_BACKOFF * 2**attempts
+# seconds, capped at MAX_BACKOFF; parked after MAX_ATTEMPTS
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 300.0
+MAX_ATTEMPTS = 12
+
+
+class DurableSpool:
+    """SQLite-backed event spool plus a background worker thread."""
+
+    table = "spool_events"          # SQLite table holding the events
+    path_env = "SPOOL_PATH"         # env var overriding the spool file
+    default_filename = "spool.db"   # spool file under app.instance_path
+    thread_name = "bee-spool"
+    label = "spool event"           # used in log lines
+    handled_stat = "handled"        # stats() key for events handled
+
+    def __init__(self, interval_ms: int, max_batch: int):
+        self.interval = interval_ms / 1000.0
+        self.max_batch = max_batch
+        self.app = None
+        self.spool_path: Optional[str] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._spool_lock = threading.Lock()
+        self._process_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.handled = 0
+        self.parked = 0
+
+    def init_app(self, app, spool_path: Optional[str] = None):
+        self.app = app
+        if spool_path is None:
+            spool_path = os.getenv(self.path_env) or os.path.join(app.instance_path, self.default_filename)
+        self._open_spool(spool_path)
+        atexit.register(self.process)
+        # Pick up anything left behind by a previous process
+        if self.pending():
+            self._start()
+
+    def _open_spool(self, spool_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(spool_path)), exist_ok=True)
+        conn = sqlite3.connect(spool_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL DEFAULT 0,"
+            " parked INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT)"
+        )
+        # Spools written before retries were scheduled only have `attempts`
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        for column, ddl in (("next_attempt_at", "REAL NOT NULL DEFAULT 0"),
+                            ("parked", "INTEGER NOT NULL DEFAULT 0"),
+                            ("last_error", "TEXT")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {column} {ddl}")
+        with self._spool_lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = conn
+            self.spool_path = spool_path
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    # -- producer side -----------------------------------------------------
+
+    def _append(self, event: Dict):
+        with self._spool_lock:
+            self._conn.execute(f"INSERT INTO {self.table} (payload) VALUES (?)", (json.dumps(event),))
+        self._start()
+
+    def pending(self) -> int:
+        with self._spool_lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table} WHERE parked = 0").fetchone()[0]
+
+    def wake(self):
+        """Ask the worker to run now instead of waiting out the interval."""
+        self._wake.set()
+
+    def clear(self):
+        """Drop every spooled event, parked ones included."""
+        with self._spool_lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    # -- consumer side -----------------------------------------------------
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.process()
+            except Exception as e:
+                print(f"⚠️ {self.label.capitalize()} worker error: {e}")
+
+    def process(self, now: Optional[float] = None) -> int:
+        """Hand every due event to the handler. Returns events handled."""
+        if self.app is None or not self.pending():
+            return 0
+        handled = 0
+        with self._process_lock, self.app.app_context():
+            while True:
+                with self._spool_lock:
+                    batch = self._conn.execute(
+                        f"SELECT id, payload, attempts FROM {self.table}"
+                        " WHERE parked = 0 AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                        (now if now is not None else time.time(), self.max_batch),
+                    ).fetchall()
+                if not batch:
+                    break
+                done = self.handle_batch(batch)
+                if done is None:  # handler asked to stop for this pass
+                    break
+                handled += done
+        self.handled += handled
+        return handled
+
+    def handle_batch(self, batch) -> Optional[int]:
+        """Handle spooled rows one at a time; failures are rescheduled, never dropped."""
+        handled = 0
+        for row_id, payload, attempts in batch:
+            try:
+                if self.handle(json.loads(payload)):
+                    handled += 1
+                self._forget([row_id])
+            except Exception as e:
+                db.session.rollback()
+                self._retry_later(row_id, attempts + 1, e)
+        return handled
+
+    def handle(self, event: Dict) -> bool:
+        """Apply one event; False if it turned out to be a no-op (already applied)."""
+        raise NotImplementedError
+
+    def _retry_later(self, row_id: int, attempts: int, error: Exception):
+        parked = attempts >= MAX_ATTEMPTS
+        delay = min(BASE_BACKOFF * (2 ** attempts), MAX_BACKOFF)
+        with self._spool_lock:
+            self._conn.execute(
+                f"UPDATE {self.table} SET attempts = ?, next_attempt_at = ?, parked = ?, last_error = ? WHERE id = ?",
+                (attempts, time.time() + delay, int(parked), str(error)[:500], row_id),
+            )
+        if parked:
+            self.parked += 1
+            print(f"❌ Parked {self.label} {row_id} after {attempts} attempts: {error}")
+        else:
+            print(f"⚠️ {self.label.capitalize()} {row_id} failed (attempt {attempts}), retrying in {delay:.0f}s: {error}")
+
+    def _forget(self, row_ids: List[int]):
+        with self._spool_lock:
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE id = ?", [(i,) for i in row_ids])
+
+    def parked_events(self) -> List[Dict]:
+        with self._spool_lock:
+            rows = self._conn.execute(
+                f"SELECT id, payload, attempts, last_error FROM {self.table} WHERE parked = 1 ORDER BY id"
+            ).fetchall()
+        return [{"id": i, "event": json.loads(p), "attempts": a, "error": e} for i, p, a, e in rows]
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending(), self.handled_stat: self.handled, "parked": self.parked}
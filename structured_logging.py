@@ -0,0 +1,183 @@
+"""
+BeeSmart Spelling App - Structured Logging
+Leveled, request-correlated, non-blocking logging for the quiz hot path.
+
+get_wordbank, /api/next, /api/answer and get_word_info used to print
+multi-line debug output (session keys, whole dicts) synchronously to stdout
+on every call. They now log through `beesmart.<module>` loggers:
+
+- Levels: LOG_LEVEL (default INFO) for everything, LOG_LEVELS for per-module
+  overrides, e.g. LOG_LEVELS="wordbank=DEBUG,dictionary=WARNING". Disabled
+  calls cost one level check; arguments are only formatted when emitted.
+- Non-blocking: records go onto a bounded in-memory queue and a listener
+  thread writes them out. If the queue is full the record is dropped and
+  counted rather than stalling a request.
+- Correlation: every request gets an id (incoming X-Request-ID if it is 1-64
+  characters of [A-Za-z0-9._-], else a fresh one), stamped on its records and
+  echoed in the response header.
+- Sampling: high-frequency DEBUG events logged with extra=SAMPLED are kept
+  at LOG_DEBUG_SAMPLE_RATE (default 1.0, i.e. all of them).
+- Format: LOG_FORMAT=json for one JSON object per line, else plain text.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from flask import g, has_request_context, request
+
+ROOT_LOGGER = "beesmart"
+REQUEST_ID_HEADER = "X-Request-ID"
+# Anything else (CR/LF in particular) could forge lines in the text log format
+VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+# Pass as extra= on high-frequency debug calls to make them subject to sampling
+SAMPLED = {"sampled": True}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+def get_logger(module: str) -> logging.Logger:
+    """Logger for one app module, e.g. get_logger("quiz") -> beesmart.quiz."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{module}")
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp the current request id (or '-') on every record."""
+
+    def filter(self, record):
+        record.request_id = g.get("request_id", "-") if has_request_context() else "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG records flagged with extra=SAMPLED."""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or not getattr(record, "sampled", False) or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking."""
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Render the traceback now (exc_info can't cross to the listener),
+        # but keep the message unformatted so the listener's formatter owns it
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            module, level = (p.strip() for p in item.split("=", 1))
+            levels[module] = logging.getLevelName(level.upper())
+    return {m: lvl for m, lvl in levels.items() if isinstance(lvl, int)}
+
+
+class LoggingSubsystem:
+    """Owns the queue, listener and request-id hooks for the beesmart loggers."""
+
+    def __init__(self, max_queue: int = 10000):
+        self.max_queue = max_queue
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+
+    def init_app(self, app, stream=None):
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper()))
+        for module, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+            get_logger(module).setLevel(level)
+        root.propagate = False
+
+        out = logging.StreamHandler(stream or sys.stdout)
+        if os.getenv("LOG_FORMAT", "text").lower() == "json":
+            out.setFormatter(JsonFormatter())
+        else:
+            out.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+        self.stop()
+        for old in list(root.handlers):
+            root.removeHandler(old)
+        self.handler = DroppingQueueHandler(queue.Queue(self.max_queue))
+        self.handler.addFilter(RequestIdFilter())
+        self.handler.addFilter(SamplingFilter(float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))))
+        root.addHandler(self.handler)
+        self.listener = QueueListener(self.handler.queue, out, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+
+        app.before_request(self._assign_request_id)
+        app.after_request(self._echo_request_id)
+
+    @staticmethod
+    def _assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = incoming if VALID_REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex[:16]
+
+    @staticmethod
+    def _echo_request_id(response):
+        if "request_id" in g:
+            response.headers.setdefault(REQUEST_ID_HEADER, g.request_id)
+        return response
+
+    def stop(self):
+        """Drain the queue and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> Dict[str, int]:
+        if self.handler is None:
+            return {"queued": 0, "dropped": 0}
+        return {"queued": self.handler.queue.qsize(), "dropped": self.handler.dropped}
+
+
+# Global instance
+logging_subsystem = LoggingSubsystem()
@@ -0,0 +1,73 @@
+"""
+Shared test setup: every test runs against a throwaway SQLite database.
+
+The environment is fixed before AjaSpellBApp is imported, so the app is built
+with TestingConfig and never touches DATABASE_URL or instance/beesmart.db.
+Each test gets freshly created tables, dropped again on teardown, and the
+process-wide caches are emptied so ids reused by the next test's rows can't
+hit stale entries.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="beesmart-tests-")
+
+os.environ["FLASK_ENV"] = "testing"
+os.environ["TEST_DATABASE_URL"] = "sqlite:///" + os.path.join(_TMP_DIR, "beesmart.db")
+os.environ["ANSWER_SPOOL_PATH"] = os.path.join(_TMP_DIR, "answer_spool.db")
+os.environ["SCORE_OUTBOX_PATH"] = os.path.join(_TMP_DIR, "score_outbox.db")
+for _var in ("DATABASE_URL", "RAILWAY_ENVIRONMENT", "REDIS_URL", "REDIS_CONNECTION_STRING", "SESSION_BACKEND"):
+    os.environ.pop(_var, None)
+
+
+def _clear_caches():
+    import paged_wordbank
+    from identity_cache import identity_cache, teacher_key_cache
+    from speed_round_leaderboard import leaderboard_cache
+    from upload_cache import upload_cache
+    from wordbank_store import wordbank_store
+
+    identity_cache.clear()
+    teacher_key_cache.clear()
+    leaderboard_cache.invalidate()
+    upload_cache.clear()
+    wordbank_store.clear_cache()
+    with paged_wordbank._PAGE_CACHE_LOCK:
+        paged_wordbank._PAGE_CACHE.clear()
+
+
+def _settle_spools():
+    """Write what the app's answer queue and score outbox hold, then drop any
+    event still waiting on a retry so it can't land in the next test's tables."""
+    from answer_queue import answer_queue
+    from score_outbox import score_outbox
+
+    answer_queue.flush()
+    score_outbox.drain()
+    answer_queue.clear()
+    score_outbox.clear()
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Fresh tables for each test, dropped afterwards."""
+    from AjaSpellBApp import app
+    from models import db
+
+    with app.app_context():
+        db.create_all()
+    _clear_caches()
+    yield db
+    _settle_spools()
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    _clear_caches()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
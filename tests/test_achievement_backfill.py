@@ -0,0 +1,69 @@
+import os
+import unittest
+from datetime import datetime
+
+from AjaSpellBApp import app
+from achievement_backfill import backfill_achievements
+from models import db, User, QuizSession, QuizResult, Achievement
+
+
+def _user(prefix):
+    name = f"{prefix}{os.urandom(4).hex()}"
+    user = User(username=name, display_name="Bee", email=f"{name}@example.com", role="student",
+                password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _session(user, words, completed=True):
+    quiz = QuizSession(user_id=user.id, total_words=len(words), completed=completed,
+                       session_end=datetime.utcnow() if completed else None)
+    db.session.add(quiz)
+    db.session.flush()
+    for n, word in enumerate(words, 1):
+        db.session.add(QuizResult(session_id=quiz.id, user_id=user.id, word=word, is_correct=True,
+                                  time_taken_seconds=2, hints_used=0, question_number=n))
+    return quiz
+
+
+class AchievementBackfillTests(unittest.TestCase):
+    def setUp(self):
+        words = [f"word{i}" for i in range(12)]
+        with app.app_context():
+            self.student = _user("student_")
+            self.quiz = _session(self.student, words)
+            _session(self.student, words, completed=False)
+            self.guest = _user("guest_")
+            _session(self.guest, words)
+            db.session.commit()
+            self.ids = (self.student.id, self.guest.id, self.quiz.id)
+
+    def _awards(self, user_id):
+        return db.session.query(Achievement).filter_by(user_id=user_id).all()
+
+    def test_awards_completed_sessions_once(self):
+        student_id, guest_id, quiz_id = self.ids
+        with app.app_context():
+            backfill_achievements(page_size=5, insert_batch=2)
+            awards = self._awards(student_id)
+            self.assertEqual({a.achievement_type for a in awards},
+                             {"perfect_game", "speed_demon", "hot_streak", "early_bird"})
+            self.assertTrue(all(a.achievement_metadata["earned_in_session"] == quiz_id for a in awards))
+            self.assertEqual(self._awards(guest_id), [])
+
+            backfill_achievements(page_size=5)
+            self.assertEqual(len(self._awards(student_id)), 4)
+
+    def test_dry_run_and_type_filter(self):
+        student_id = self.ids[0]
+        with app.app_context():
+            counts = backfill_achievements(["hot_streak"], dry_run=True)
+            self.assertEqual(counts, {"hot_streak": 1})
+            self.assertEqual(self._awards(student_id), [])
+            with self.assertRaises(ValueError):
+                backfill_achievements(["not_a_badge"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from achievements import (BADGE_METADATA, BADGES, accumulator_from_history, evaluate,
+                          new_accumulator, record_answer, wrong_attempts)
+from AjaSpellBApp import app, check_badges
+
+
+def _types(acc):
+    return {b["type"] for b in evaluate(acc)}
+
+
+class AchievementRuleTests(unittest.TestCase):
+    def test_registry_drives_metadata(self):
+        self.assertEqual(set(BADGE_METADATA), {b.type for b in BADGES})
+        self.assertEqual(BADGE_METADATA["perfect_game"]["points"], 500)
+
+    def test_fast_perfect_game(self):
+        acc = new_accumulator()
+        for i in range(12):
+            record_answer(acc, f"w{i}", True, elapsed_ms=3000)
+        self.assertEqual(_types(acc), {"perfect_game", "speed_demon", "hot_streak", "early_bird"})
+
+    def test_comeback_and_hint_ratio(self):
+        acc = new_accumulator()
+        record_answer(acc, "rhythm", False)
+        record_answer(acc, "rhythm", False)
+        self.assertEqual(wrong_attempts(acc, "rhythm"), 2)
+        record_answer(acc, "rhythm", True, elapsed_ms=20000, hints=1)
+        for i in range(9):
+            record_answer(acc, f"w{i}", True, elapsed_ms=20000)
+        earned = _types(acc)
+        self.assertIn("comeback_kid", earned)
+        self.assertIn("honey_hunter", earned)
+        self.assertNotIn("perfect_game", earned)
+        self.assertNotIn("speed_demon", earned)
+
+    def test_states_without_accumulator_are_rebuilt_from_history(self):
+        history = [{"word": f"w{i}", "correct": True, "elapsed_ms": 1000} for i in range(10)]
+        state = {"history": history}
+        self.assertEqual({b["type"] for b in check_badges(state, [])},
+                         _types(accumulator_from_history(history)))
+        self.assertIn("badge_acc", state)
+
+    def test_quiz_completion_awards_from_accumulator(self):
+        client = app.test_client()
+        client.post("/api/upload", json={"words": [{"word": f"word{c}"} for c in "abcdefghij"]})
+        for _ in range(10):
+            word = client.post("/api/next").get_json()["word"]
+            data = client.post("/api/answer", json={"user_input": word, "elapsed_ms": 2000}).get_json()
+        self.assertTrue(data["quiz_complete"])
+        self.assertIn("perfect_game", {b["type"] for b in data["badges"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from AjaSpellBApp import app
+from answer_queue import AnswerQueue, answer_queue
+from models import db, User, QuizSession, QuizResult, WordMastery
+from spool import MAX_ATTEMPTS, MAX_BACKOFF
+
+
+class AnswerQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = AnswerQueue(flush_interval_ms=60000)
+        self.queue.init_app(app, spool_path=os.path.join(self.tmp.name, "spool.db"))
+        with app.app_context():
+            user = User(username=f"queue_{os.urandom(4).hex()}", display_name="Queue Test", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.flush()
+            quiz = QuizSession(user_id=user.id, total_words=3)
+            db.session.add(quiz)
+            db.session.commit()
+            self.user_id, self.session_id = user.id, quiz.id
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _answer(self, word, correct, **extra):
+        return self.queue.enqueue(session_id=self.session_id, user_id=self.user_id, word=word,
+                                  is_correct=correct, user_answer=word, time_taken_seconds=2.5,
+                                  input_method="keyboard", points_earned=100 if correct else 0,
+                                  hints_used=0, question_number=1, **extra)
+
+    def test_batch_writes_results_and_mastery(self):
+        self._answer("garden", True)
+        self._answer("garden", False)
+        self._answer("pencil", True)
+        self.assertEqual(self.queue.pending(), 3)
+        self.assertEqual(self.queue.flush(), 3)
+        self.assertEqual(self.queue.pending(), 0)
+        with app.app_context():
+            self.assertEqual(QuizResult.query.filter_by(session_id=self.session_id).count(), 3)
+            garden = WordMastery.query.filter_by(user_id=self.user_id, word="garden").one()
+            self.assertEqual((garden.times_seen, garden.times_correct, garden.times_incorrect), (2, 1, 1))
+
+    def test_replayed_events_are_not_written_twice(self):
+        event_id = self._answer("rocket", True)
+        self.queue.flush()
+        # Simulate a crash after commit but before the spool row was removed
+        self.queue._conn.execute("INSERT INTO answer_events (payload) VALUES (?)",
+                                 (json.dumps({"uuid": event_id, "session_id": self.session_id,
+                                              "user_id": self.user_id, "word": "rocket",
+                                              "is_correct": True, "timestamp": "2026-01-01T00:00:00"}),))
+        reopened = AnswerQueue(flush_interval_ms=60000)
+        reopened.init_app(app, spool_path=self.queue.spool_path)
+        self.assertEqual(reopened.flush(), 0)
+        self.assertEqual(reopened.pending(), 0)
+        with app.app_context():
+            self.assertEqual(QuizResult.query.filter_by(uuid=event_id).count(), 1)
+            self.assertEqual(WordMastery.query.filter_by(user_id=self.user_id, word="rocket").one().times_seen, 1)
+
+    def test_failing_event_backs_off_and_is_parked_not_dropped(self):
+        self._answer("garden", True)
+        # An event the writer can't handle (no word) while the database is healthy
+        self.queue._conn.execute("INSERT INTO answer_events (payload) VALUES (?)",
+                                 (json.dumps({"uuid": "broken", "session_id": self.session_id}),))
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(self.queue.pending(), 1)
+        self.assertEqual(self.queue.flush(), 0)  # not due again yet
+        for _ in range(MAX_ATTEMPTS):
+            self.queue.flush(now=time.time() + 10 * MAX_BACKOFF)
+        self.assertEqual(self.queue.pending(), 0)
+        parked = self.queue.parked_events()
+        self.assertEqual([(p["event"]["uuid"], p["attempts"]) for p in parked], [("broken", MAX_ATTEMPTS)])
+
+    def test_answer_endpoint_spools_instead_of_writing(self):
+        client = app.test_client()
+        client.post("/api/upload", json={"words": [{"word": "garden"}, {"word": "pencil"}]})
+        for _ in range(2):
+            word = client.post("/api/next").get_json()["word"]
+            self.assertTrue(client.post("/api/answer", json={"user_input": word}).get_json()["correct"])
+        with client.session_transaction() as sess:
+            session_id = sess["quiz_state_v1"]["db_session_id"]
+        answer_queue.flush()
+        with app.app_context():
+            self.assertEqual(QuizResult.query.filter_by(session_id=session_id).count(), 2)
+
+if __name__ == "__main__":
+    unittest.main()
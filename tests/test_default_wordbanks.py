@@ -0,0 +1,42 @@
+import os
+import unittest
+from unittest import mock
+
+from AjaSpellBApp import app
+from default_wordbanks import DEFAULT_SETS, PLAIN_SENTENCE, default_wordbanks, parse_word_file
+from models import db, SharedWordbank
+from wordbank_store import wordbank_store
+
+
+class DefaultWordbankTests(unittest.TestCase):
+    def test_sets_are_pinned_once_and_survive_cache_clears(self):
+        refs = default_wordbanks.refs()
+        self.assertEqual(set(refs), {name for name, _ in DEFAULT_SETS})
+        kid = refs["kid_friendly_50"]
+        path = os.path.join(default_wordbanks.base_dir, "50Words_kidfriendly.txt")
+        self.assertEqual(len(wordbank_store.get(kid)), len(parse_word_file(path)))
+        wordbank_store.clear_cache()
+        with app.app_context():
+            self.assertIs(wordbank_store.get(kid), wordbank_store.get(kid))
+            self.assertIsNone(db.session.get(SharedWordbank, kid))
+        self.assertEqual(default_wordbanks.preload(wordbank_store), refs)
+
+    def test_default_set_carries_definitions(self):
+        self.assertEqual(default_wordbanks.current_name(), "kid_friendly_50")
+        records = wordbank_store.get(default_wordbanks.current())
+        self.assertFalse([r["word"] for r in records if r["sentence"] == PLAIN_SENTENCE])
+
+    def test_new_session_references_current_set_without_reading_files(self):
+        client = app.test_client()
+        with mock.patch("default_wordbanks.parse_word_file") as parse:
+            word = client.post("/api/next").get_json()["word"]
+            parse.assert_not_called()
+        with client.session_transaction() as sess:
+            self.assertEqual(sess["wordbank_ref"], default_wordbanks.current())
+            self.assertTrue(sess["using_default_words"])
+        records = wordbank_store.get(default_wordbanks.current())
+        self.assertIn(word, {r["word"] for r in records})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import unittest
+
+from AjaSpellBApp import app
+from identity_cache import teacher_key_cache
+from models import db, User, QuizSession, TeacherStudent
+
+WORDS = [{"word": w} for w in ("garden", "pencil", "rocket")]
+
+
+def _user(prefix, role):
+    user = User(username=f"{prefix}{os.urandom(4).hex()}", display_name=prefix, role=role)
+    user.set_password("pw123456")
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+class DeferredQuizSessionTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            self.teacher_key = f"T{os.urandom(4).hex()}"
+            teacher = _user("teacher_", "teacher")
+            student = _user("student_", "student")
+            db.session.commit()
+            self.teacher_id, self.student_id = teacher.id, student.id
+        teacher_key_cache.clear()
+
+    def _link(self):
+        db.session.add(TeacherStudent(teacher_key=self.teacher_key, teacher_user_id=self.teacher_id,
+                                      student_id=self.student_id))
+        db.session.commit()
+
+    def test_session_created_on_first_answer_with_teacher_key(self):
+        with app.app_context():
+            self._link()
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(self.student_id)
+        client.post("/api/upload", json={"words": WORDS})
+        word = client.post("/api/next").get_json()["word"]
+        with app.app_context():
+            self.assertEqual(QuizSession.query.filter_by(user_id=self.student_id).count(), 0)
+
+        client.post("/api/answer", json={"user_input": word})
+        with client.session_transaction() as sess:
+            session_id = sess["quiz_state_v1"]["db_session_id"]
+        with app.app_context():
+            quiz = db.session.get(QuizSession, session_id)
+            self.assertEqual(quiz.user_id, self.student_id)
+            self.assertEqual(quiz.teacher_key, self.teacher_key)
+
+    def test_teacher_key_cache_invalidated_on_link_changes(self):
+        with app.app_context():
+            self.assertIsNone(teacher_key_cache.get(self.student_id))
+            self._link()
+            self.assertEqual(teacher_key_cache.get(self.student_id), self.teacher_key)
+            link = TeacherStudent.query.filter_by(student_id=self.student_id).one()
+            link.is_active = False
+            db.session.commit()
+            self.assertIsNone(teacher_key_cache.get(self.student_id))
+
+
+    def test_link_made_elsewhere_is_seen_and_stamped_at_completion(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(self.student_id)
+        client.post("/api/upload", json={"words": WORDS})
+        word = client.post("/api/next").get_json()["word"]
+        client.post("/api/answer", json={"user_input": word})
+        with client.session_transaction() as sess:
+            session_id = sess["quiz_state_v1"]["db_session_id"]
+        with app.app_context():
+            self.assertIsNone(db.session.get(QuizSession, session_id).teacher_key)
+            # Another worker links the student: no ORM event fires in this process
+            db.session.execute(TeacherStudent.__table__.insert().values(
+                teacher_key=self.teacher_key, teacher_user_id=self.teacher_id,
+                student_id=self.student_id, is_active=True))
+            db.session.commit()
+            self.assertEqual(teacher_key_cache.get(self.student_id), self.teacher_key)
+
+        for _ in WORDS[1:]:
+            word = client.post("/api/next").get_json()["word"]
+            client.post("/api/answer", json={"user_input": word})
+        with app.app_context():
+            quiz = db.session.get(QuizSession, session_id)
+            self.assertTrue(quiz.completed)
+            self.assertEqual(quiz.teacher_key, self.teacher_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
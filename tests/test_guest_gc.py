@@ -0,0 +1,69 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from AjaSpellBApp import app, GUEST_PASSWORD_SENTINEL
+from guest_gc import collect_stale_guests
+from models import db, User, QuizSession, QuizResult, WordMastery, WordList, WordListItem
+
+
+def _user(prefix, created_at, **kw):
+    name = f"{prefix}{os.urandom(4).hex()}"
+    user = User(username=name, display_name="NewBee", email=f"{name}@beesmart.guest",
+                role="guest", password_hash=GUEST_PASSWORD_SENTINEL, created_at=created_at, **kw)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+class GuestGCTests(unittest.TestCase):
+    def setUp(self):
+        old = datetime.utcnow() - timedelta(days=90)
+        with app.app_context():
+            self.stale = _user("guest_", old)
+            quiz = QuizSession(user_id=self.stale.id, total_words=1, session_start=old)
+            db.session.add(quiz)
+            db.session.flush()
+            db.session.add(QuizResult(session_id=quiz.id, user_id=self.stale.id, word="garden",
+                                      is_correct=True, timestamp=old))
+            db.session.add(WordMastery(user_id=self.stale.id, word="garden", times_seen=1))
+            wl = WordList(created_by_user_id=self.stale.id, list_name="old", word_count=1,
+                          created_at=old, updated_at=old)
+            db.session.add(wl)
+            db.session.flush()
+            db.session.add(WordListItem(word_list_id=wl.id, word="garden", position=1))
+
+            self.active = _user("guest_", old)
+            db.session.add(QuizSession(user_id=self.active.id, total_words=1))
+            self.student = _user("student_", old)
+            # Only a recently saved word list shows this guest is still around
+            self.lister = _user("guest_", old)
+            db.session.add(WordList(created_by_user_id=self.lister.id, list_name="fresh", word_count=0))
+            db.session.commit()
+            self.ids = (self.stale.id, self.active.id, self.student.id, self.lister.id)
+
+    def test_dry_run_counts_without_deleting(self):
+        with app.app_context():
+            totals = collect_stale_guests(days=30, dry_run=True)
+            self.assertEqual(totals["users"], 1)
+            self.assertEqual(totals["quiz_results"], 1)
+            self.assertEqual(totals["word_list_items"], 1)
+            self.assertIsNotNone(db.session.get(User, self.ids[0]))
+
+    def test_deletes_only_stale_guests_in_batches(self):
+        with app.app_context():
+            totals = collect_stale_guests(days=30, batch_size=1)
+            self.assertEqual(totals["users"], 1)
+            self.assertEqual(totals["quiz_sessions"], 1)
+            self.assertEqual(totals["word_mastery"], 1)
+            self.assertEqual(totals["word_lists"], 1)
+            stale, active, student, lister = (db.session.get(User, i) for i in self.ids)
+            self.assertIsNone(stale)
+            self.assertIsNotNone(active)
+            self.assertIsNotNone(student)
+            self.assertIsNotNone(lister)
+            self.assertEqual(QuizResult.query.filter_by(user_id=self.ids[0]).count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from AjaSpellBApp import app, GUEST_MATERIALIZE_ANSWERS, GUEST_PASSWORD_SENTINEL
+from answer_queue import answer_queue
+from models import db, User, QuizResult
+
+WORDS = [{"word": w} for w in ("garden", "pencil", "rocket", "button", "planet", "window")]
+
+
+class GuestMaterializationTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            self.users_before = User.query.count()
+
+    def _answer(self, client, correct=True):
+        word = client.post("/api/next").get_json()["word"]
+        return client.post("/api/answer", json={"user_input": word if correct else "nope"}).get_json()
+
+    def test_browsing_visitor_creates_no_rows(self):
+        client = app.test_client()
+        client.post("/api/upload", json={"words": WORDS})
+        client.post("/api/next")
+        self.assertEqual(client.get("/api/saved-lists").get_json(), {"ok": True, "lists": []})
+        client.get("/api/user/level")
+        with client.session_transaction() as sess:
+            self.assertNotIn("guest_user_id", sess)
+            self.assertIsNone(sess["quiz_state_v1"]["db_session_id"])
+        with app.app_context():
+            self.assertEqual(User.query.count(), self.users_before)
+
+    def test_guest_is_materialized_and_buffered_answers_replayed(self):
+        client = app.test_client()
+        client.post("/api/upload", json={"words": WORDS})
+        for i in range(GUEST_MATERIALIZE_ANSWERS):
+            self._answer(client, correct=i != 0)
+        with client.session_transaction() as sess:
+            guest_id = sess["guest_user_id"]
+            session_id = sess["quiz_state_v1"]["db_session_id"]
+        self.assertIsNotNone(session_id)
+        self._answer(client)
+        answer_queue.flush()
+        with app.app_context():
+            guest = db.session.get(User, guest_id)
+            self.assertEqual(guest.password_hash, GUEST_PASSWORD_SENTINEL)
+            self.assertFalse(guest.check_password(GUEST_PASSWORD_SENTINEL))
+            results = QuizResult.query.filter_by(session_id=session_id).order_by(QuizResult.question_number).all()
+            self.assertEqual([r.question_number for r in results], list(range(1, GUEST_MATERIALIZE_ANSWERS + 2)))
+            self.assertFalse(results[0].is_correct)
+
+
+if __name__ == "__main__":
+    unittest.main()
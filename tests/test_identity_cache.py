@@ -0,0 +1,86 @@
+import os
+import unittest
+
+from werkzeug.exceptions import Unauthorized
+
+from AjaSpellBApp import app, load_user
+from identity_cache import CachedIdentity, identity_cache
+from models import db, User
+
+
+class IdentityCacheTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            user = User(username=f"ident_{os.urandom(4).hex()}", display_name="Ident Test", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+        identity_cache.clear()
+
+    def test_repeat_loads_are_served_from_cache(self):
+        with app.app_context():
+            first = load_user(str(self.user_id))
+            hits = identity_cache.stats()["hits"]
+            second = load_user(str(self.user_id))
+            self.assertIsInstance(second, CachedIdentity)
+            self.assertEqual(identity_cache.stats()["hits"], hits + 1)
+            self.assertIsNone(object.__getattribute__(second, "_user"))
+            self.assertEqual(second.display_name, "Ident Test")
+            self.assertEqual(second.get_id(), str(self.user_id))
+            self.assertEqual(first, second)
+            self.assertIn("urls", second.get_avatar_data())
+
+    def test_profile_change_invalidates(self):
+        with app.app_context():
+            load_user(str(self.user_id))
+            user = db.session.get(User, self.user_id)
+            user.display_name = "Renamed"
+            db.session.commit()
+        with app.app_context():
+            self.assertEqual(load_user(str(self.user_id)).display_name, "Renamed")
+
+    def test_stats_changes_keep_entry_and_writes_reach_the_row(self):
+        with app.app_context():
+            load_user(str(self.user_id))
+            cached = load_user(str(self.user_id))
+            cached.total_lifetime_points = (cached.total_lifetime_points or 0) + 40
+            db.session.commit()
+            self.assertIn(self.user_id, identity_cache._entries)
+        with app.app_context():
+            self.assertEqual(db.session.get(User, self.user_id).total_lifetime_points, 40)
+
+
+    def test_row_deleted_elsewhere_logs_the_request_out(self):
+        with app.test_request_context():
+            load_user(str(self.user_id))
+            cached = load_user(str(self.user_id))
+            # Deleted by another worker: no ORM event reaches this process
+            db.session.execute(User.__table__.delete().where(User.id == self.user_id))
+            db.session.commit()
+            with self.assertRaises(Unauthorized):
+                cached.total_lifetime_points
+            self.assertNotIn(self.user_id, identity_cache._entries)
+
+    def test_admin_bulk_delete_invalidates_identities(self):
+        with app.app_context():
+            admin = User(username=f"admin_{os.urandom(4).hex()}", display_name="Admin", role="admin")
+            admin.set_password("pw123456")
+            db.session.add(admin)
+            db.session.commit()
+            admin_id = admin.id
+            load_user(str(self.user_id))
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(admin_id)
+        resp = client.post("/api/admin/users/bulk-delete", json={"user_ids": [self.user_id]})
+        self.assertEqual(resp.get_json()["deleted_count"], 1)
+        self.assertNotIn(self.user_id, identity_cache._entries)
+        with app.app_context():
+            self.assertIsNone(load_user(str(self.user_id)))
+            db.session.delete(db.session.get(User, admin_id))
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
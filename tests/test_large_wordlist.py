@@ -0,0 +1,102 @@
+import io
+import itertools
+import json
+import unittest
+from datetime import timedelta
+
+from AjaSpellBApp import app, MAX_RECORDS, parse_csv, parse_txt
+from models import db, WordList, WordListItem
+from paged_wordbank import AffineOrder, PagedWordbank, list_version
+
+
+def _words(n):
+    letters = "bcdfgklmnprt"
+    combos = ("".join(p) for p in itertools.product(letters, "aeiou", letters, "aeiou"))
+    return list(itertools.islice(combos, n))
+
+
+class StreamingParserTests(unittest.TestCase):
+    def test_txt_and_csv_parsers_stream_identically(self):
+        self.assertEqual(
+            parse_txt(b"cat|The cat sat.\n\ndog||Barks\n"),
+            [{"word": "cat", "sentence": "The cat sat.", "hint": ""},
+             {"word": "dog", "sentence": "", "hint": "Barks"}],
+        )
+        self.assertEqual(
+            parse_csv(b"\xef\xbb\xbfWord,Sentence\ncat,The cat sat.\n,\n", "list.csv"),
+            [{"word": "cat", "sentence": "The cat sat.", "hint": ""}],
+        )
+        self.assertEqual(parse_csv(b"cat,The cat sat.\ndog\n", "list.csv")[1]["word"], "dog")
+
+    def test_affine_order_is_a_permutation(self):
+        for n in (1, 2, 10, 501, 1024):
+            order = AffineOrder.random(n)
+            self.assertEqual(sorted(order), list(range(n)))
+            self.assertEqual(list(AffineOrder.from_state(order.to_state())), list(order))
+
+    def test_affine_order_mixes_consecutive_positions(self):
+        order = AffineOrder.random(1000)
+        steps = {(order[i + 1] - order[i]) % 1000 for i in range(50)}
+        self.assertGreater(len(steps), 1)
+        # Orders saved before mixing existed replay unchanged
+        self.assertEqual(list(AffineOrder.from_state({"n": 5, "a": 2, "b": 1})), [1, 3, 0, 2, 4])
+
+
+class LargeWordListTests(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def _upload(self, words, name="district.txt"):
+        body = "\n".join(words).encode("utf-8")
+        return self.client.post(
+            "/api/upload-large",
+            data={"file": (io.BytesIO(body), name), "list_name": "District list"},
+            content_type="multipart/form-data",
+        )
+
+    def test_large_upload_is_paged_and_quizzable(self):
+        words = _words(MAX_RECORDS + 200)
+        resp = self._upload(words + words[:25])
+        data = json.loads(resp.data)
+        self.assertEqual(resp.status_code, 200, data)
+        self.assertTrue(data["paged"])
+        self.assertEqual(data["duplicates"], 25)
+        self.assertGreater(data["count"], MAX_RECORDS)
+
+        with self.client.session_transaction() as sess:
+            self.assertNotIn("wordbank_v1", sess)
+            self.assertEqual(sess["large_wordlist_v1"]["count"], data["count"])
+            self.assertEqual(sess["quiz_state_v1"]["order"], [])
+
+        wb = json.loads(self.client.get("/api/wordbank").data)
+        self.assertTrue(wb["paged"])
+        self.assertEqual(wb["count"], data["count"])
+        self.assertLess(len(wb["words"]), data["count"])
+
+        question = json.loads(self.client.post("/api/next").data)
+        self.assertEqual(question["total"], data["count"])
+        self.assertIn("sentence", question)
+
+    def test_replaced_list_is_not_served_from_stale_pages(self):
+        self._upload(_words(MAX_RECORDS + 10))
+        with self.client.session_transaction() as sess:
+            list_id = sess["large_wordlist_v1"]["id"]
+        with app.app_context():
+            old = PagedWordbank(list_id, 5, version=list_version(list_id))[0]["word"]
+            # Another worker replaces the items; this process's cache is not told
+            wl = db.session.get(WordList, list_id)
+            db.session.query(WordListItem).filter_by(word_list_id=list_id, position=1).update({"word": "zebra"})
+            wl.updated_at = wl.updated_at + timedelta(seconds=1)
+            db.session.commit()
+            self.assertNotEqual(old, "zebra")
+            self.assertEqual(PagedWordbank(list_id, 5, version=list_version(list_id))[0]["word"], "zebra")
+
+    def test_clear_drops_large_list_from_session(self):
+        self._upload(_words(MAX_RECORDS + 10))
+        self.client.post("/api/clear", json={"confirmed": True})
+        with self.client.session_transaction() as sess:
+            self.assertNotIn("large_wordlist_v1", sess)
+
+
+if __name__ == "__main__":
+    unittest.main()
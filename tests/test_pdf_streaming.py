@@ -0,0 +1,76 @@
+import io
+import time
+import unittest
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from AjaSpellBApp import app, iter_pdf_records, parse_pdf
+
+
+def _pdf(pages):
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for words in pages:
+        y = 720
+        for word in words:
+            c.drawString(72, y, word)
+            y -= 20
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+PAGES = [["garden", "pencil"], ["rocket", "button"], ["planet", "window"]]
+
+
+class PdfStreamingTests(unittest.TestCase):
+    def test_parses_all_pages_in_order(self):
+        words = [r["word"] for r in parse_pdf(_pdf(PAGES))]
+        self.assertEqual(words, [w for page in PAGES for w in page])
+
+    def test_reports_per_page_timing(self):
+        timings = []
+        parse_pdf(_pdf(PAGES), on_page=lambda page, ms, found: timings.append((page, ms, found)))
+        self.assertEqual([t[0] for t in timings], [1, 2, 3])
+        self.assertTrue(all(ms >= 0 and found == 2 for _, ms, found in timings))
+
+    def test_stops_at_record_and_page_budgets(self):
+        content = _pdf(PAGES)
+        by_records = [r["word"] for r in iter_pdf_records(content, max_records=2)]
+        self.assertEqual(by_records, ["garden", "pencil"])
+        budgets = []
+        by_pages = list(iter_pdf_records(content, max_records=None, max_pages=2, on_budget=budgets.append))
+        self.assertEqual((len(by_pages), budgets), (4, ["pages"]))
+        budgets = []
+        exact = list(iter_pdf_records(content, max_records=None, max_pages=3, on_budget=budgets.append))
+        self.assertEqual((len(exact), budgets), (6, []))
+
+        budgets = []
+        by_time = list(iter_pdf_records(content, max_records=None, max_pages=None, time_budget=0,
+                                        on_budget=budgets.append))
+        self.assertEqual((len(by_time), budgets), (2, ["time"]))
+
+    def test_enhanced_upload_file_is_parsed_off_the_request(self):
+        client = app.test_client()
+        resp = client.post("/api/upload-enhanced", data={"file": (io.BytesIO(_pdf(PAGES[:1])), "list.pdf")},
+                           content_type="multipart/form-data")
+        job_id = resp.get_json()["session_id"]
+        # Another visitor can't watch (or collect the words of) someone else's upload
+        self.assertEqual(app.test_client().get(f"/api/upload-progress/{job_id}").status_code, 404)
+        deadline = time.time() + 15
+        progress = {}
+        while time.time() < deadline:
+            progress = client.get(f"/api/upload-progress/{job_id}").get_json()
+            if progress["status"] in ("completed", "error"):
+                break
+            time.sleep(0.05)
+        self.assertEqual(progress["status"], "completed", progress.get("message"))
+        self.assertNotIn("records", progress)
+        self.assertNotIn("owner", progress)
+        words = [w["word"] for w in client.get("/api/wordbank").get_json()["words"]]
+        self.assertEqual(words, PAGES[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import AjaSpellBApp
+from AjaSpellBApp import app, compile_question
+from wordbank_store import wordbank_store
+
+
+RECORDS = [{"word": "garden", "sentence": "The garden is green.", "hint": ""},
+           {"word": "pencil", "sentence": "", "hint": "You write with a pencil"},
+           {"word": "rocket", "sentence": "", "hint": ""}]
+
+
+class QuestionPayloadTests(unittest.TestCase):
+    def test_compile_question_blanks_and_picks_a_prompt(self):
+        garden, pencil, rocket = (compile_question(r) for r in RECORDS)
+        self.assertNotIn("garden", garden["definition"].lower())
+        self.assertEqual(garden["definition_source"], "sentence")
+        self.assertTrue(pencil["definition"].startswith("Hint: "))
+        self.assertNotIn("pencil", pencil["hint"].lower())
+        self.assertEqual(rocket["definition_source"], "fallback")
+        self.assertFalse(rocket["has_definition"])
+        self.assertTrue(garden["phonetic_spelling"])
+
+    def test_payloads_are_compiled_once_per_wordbank(self):
+        client = app.test_client()
+        with mock.patch.object(AjaSpellBApp, "compile_question", wraps=compile_question) as compiled:
+            wordbank_store.clear_cache()
+            client.post("/api/upload", json={"words": RECORDS})
+            self.assertEqual(compiled.call_count, len(RECORDS))
+            seen = set()
+            for _ in RECORDS:
+                data = client.post("/api/next").get_json()
+                seen.add(data["word"])
+                self.assertNotIn(data["word"], data["definition"].lower())
+                client.post("/api/answer", json={"user_input": data["word"], "method": "keyboard"})
+            self.assertEqual(compiled.call_count, len(RECORDS))
+        self.assertEqual(seen, {r["word"] for r in RECORDS})
+
+    def test_prefetch_returns_upcoming_questions_without_letters(self):
+        client = app.test_client()
+        client.post("/api/upload", json={"words": RECORDS})
+        data = client.post("/api/next?prefetch=5").get_json()
+        self.assertEqual([q["index"] for q in data["upcoming"]], [2, 3])
+        for q in [data] + data["upcoming"]:
+            self.assertNotIn("phonetic_spelling", q)
+        self.assertNotIn("upcoming", client.post("/api/next").get_json())
+
+        stale = client.post("/api/answer", json={"user_input": "x", "index": 2})
+        self.assertEqual(stale.status_code, 409)
+        ok = client.post("/api/answer", json={"user_input": data["word"], "index": 1})
+        self.assertTrue(ok.get_json()["correct"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from AjaSpellBApp import app
+from models import db, User, OutboxReceipt, SpeedRoundScore
+from score_outbox import ScoreOutbox, score_outbox
+from spool import MAX_ATTEMPTS
+
+SCORE = {"words_attempted": 5, "words_correct": 4, "total_time": 31.5, "honey_points_earned": 60,
+         "longest_streak": 3, "average_time_per_word": 6.3, "fastest_word_time": 2.1,
+         "speed_bonuses_earned": 1, "word_details": [{"word": "garden", "correct": True}],
+         "difficulty_level": "grade_3_4"}
+
+
+class ScoreOutboxTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.outbox = ScoreOutbox(poll_interval_ms=60000)
+        self.outbox.init_app(app, spool_path=os.path.join(self.tmp.name, "outbox.db"))
+        with app.app_context():
+            user = User(username=f"outbox_{os.urandom(4).hex()}", display_name="Outbox", role="student",
+                        total_lifetime_points=100)
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _scores(self):
+        return SpeedRoundScore.query.filter_by(user_id=self.user_id).all()
+
+    def test_enqueue_then_drain_applies_once(self):
+        key = self.outbox.enqueue_speed_round(self.user_id, SCORE)
+        self.assertEqual(self.outbox.drain(), 1)
+        self.assertEqual(self.outbox.pending(), 0)
+        with app.app_context():
+            scores = self._scores()
+            self.assertEqual(len(scores), 1)
+            self.assertEqual(scores[0].word_details, SCORE["word_details"])
+            self.assertIsNotNone(scores[0].completed_at)
+            self.assertEqual(db.session.get(User, self.user_id).total_lifetime_points, 160)
+            self.assertEqual(db.session.get(OutboxReceipt, key).result_id, scores[0].id)
+
+        # Replaying an event whose spool row outlived the commit is a no-op
+        event = {"key": key, "kind": "speed_round_score", "user_id": self.user_id, "score": SCORE,
+                 "completed_at": "2026-01-01T00:00:00"}
+        self.outbox._conn.execute("INSERT INTO outbox_events (payload) VALUES (?)", (json.dumps(event),))
+        self.assertEqual(self.outbox.drain(), 0)
+        with app.app_context():
+            self.assertEqual(len(self._scores()), 1)
+            self.assertEqual(db.session.get(User, self.user_id).total_lifetime_points, 160)
+
+    def test_failures_back_off_then_park(self):
+        self.outbox.enqueue_speed_round(self.user_id, SCORE)
+        with mock.patch.object(ScoreOutbox, "_apply", side_effect=RuntimeError("db down")):
+            self.assertEqual(self.outbox.drain(), 0)
+            # Not due yet: backoff keeps it out of the next pass
+            self.assertEqual(self.outbox.drain(), 0)
+            attempts = self.outbox._conn.execute("SELECT attempts FROM outbox_events").fetchone()[0]
+            self.assertEqual(attempts, 1)
+            for _ in range(MAX_ATTEMPTS):
+                self.outbox.drain(now=time.time() + 10 ** 6)
+        self.assertEqual(self.outbox.pending(), 0)
+        self.assertEqual(len(self.outbox.parked_events()), 1)
+
+    def test_complete_endpoint_acknowledges_before_write(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(self.user_id)
+        client.post("/api/speed-round/start", json={"word_count": 2, "word_source": "auto"})
+        for _ in range(2):
+            word = client.get("/api/speed-round/next").get_json()["word"]
+            client.post("/api/speed-round/answer", json={"user_input": word, "elapsed_ms": 1000})
+        data = client.post("/api/speed-round/complete").get_json()
+        self.assertEqual(data["status"], "success")
+        self.assertTrue(data["score_key"])
+        score_outbox.drain()
+        with app.app_context():
+            self.assertEqual(db.session.get(OutboxReceipt, data["score_key"]).kind, "speed_round_score")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import time
+import unittest
+import uuid
+from datetime import timedelta
+
+from flask import Flask, session
+
+from models import ServerSession, db
+from server_session import MemorySessionStore, configure_session_backend, mark_untouched, rotate_session_id
+
+
+def _make_app(ttl_seconds=3600):
+    app = Flask(__name__)
+    app.secret_key = "test-secret"
+    app.permanent_session_lifetime = timedelta(seconds=ttl_seconds)
+    configure_session_backend(app, "memory")
+
+    @app.before_request
+    def stamp():
+        if not session.get("session_id"):
+            session["session_id"] = str(uuid.uuid4())
+            mark_untouched(session)
+
+    @app.route("/set")
+    def set_value():
+        session["words"] = [{"word": f"word{i}", "sentence": "x" * 200} for i in range(100)]
+        return "ok"
+
+    @app.route("/get")
+    def get_value():
+        return str(len(session.get("words", [])))
+
+    @app.route("/login")
+    def login():
+        rotate_session_id(session)
+        session["user"] = "bee"
+        return "ok"
+
+    return app
+
+
+class ServerSessionTests(unittest.TestCase):
+    def test_cookie_holds_only_the_id(self):
+        client = _make_app().test_client()
+        client.get("/set")
+        cookie = client.get_cookie("session")
+        self.assertLess(len(cookie.value), 100)
+        self.assertEqual(client.get("/get").get_data(as_text=True), "100")
+
+    def test_visit_without_data_stores_nothing(self):
+        app = _make_app()
+        client = app.test_client()
+        client.get("/get")
+        self.assertIsNone(client.get_cookie("session"))
+        self.assertEqual(app.session_interface.store._data, {})
+        client.get("/set")
+        self.assertIsNotNone(client.get_cookie("session"))
+        self.assertEqual(len(app.session_interface.store._data), 1)
+
+    def test_tampered_cookie_starts_a_new_session(self):
+        client = _make_app().test_client()
+        client.get("/set")
+        client.set_cookie("session", client.get_cookie("session").value + "x")
+        self.assertEqual(client.get("/get").get_data(as_text=True), "0")
+
+    def test_memory_store_expires_entries(self):
+        store = MemorySessionStore()
+        store.save("sid", b"{}", ttl_seconds=0)
+        self.assertEqual(store.load("sid"), (None, None))
+        store.save("sid", b"{}", ttl_seconds=60)
+        self.assertEqual(store.load("sid")[0], b"{}")
+
+    def test_cookie_backend_is_still_available(self):
+        app = Flask(__name__)
+        self.assertEqual(configure_session_backend(app, "cookie"), "cookie")
+        self.assertEqual(configure_session_backend(app, "redis"), "memory")
+
+    def test_missing_redis_falls_back_to_shared_sql_store(self):
+        app = Flask(__name__)
+        self.assertEqual(configure_session_backend(app, "redis", db=db, model=ServerSession), "sql")
+
+    def test_login_rotates_session_id_and_drops_the_old_one(self):
+        app = _make_app()
+        store = app.session_interface.store
+        client = app.test_client()
+        client.get("/set")
+        before = client.get_cookie("session").value
+        old_sid = next(iter(store._data))
+        client.get("/login")
+        self.assertNotEqual(client.get_cookie("session").value, before)
+        self.assertEqual(client.get("/get").get_data(as_text=True), "100")
+        self.assertNotIn(old_sid, store._data)
+
+    def test_sql_store_purges_expired_rows(self):
+        from AjaSpellBApp import app
+        from server_session import SQLSessionStore
+        with app.app_context():
+            store = SQLSessionStore(db, ServerSession, purge_interval_seconds=0)
+            store.save("expired-sid", b"{}", ttl_seconds=-10)
+            store.save("live-sid", b"{}", ttl_seconds=60)
+            self.assertIsNone(db.session.get(ServerSession, "expired-sid"))
+            self.assertIsNotNone(db.session.get(ServerSession, "live-sid"))
+            # Naive UTC expiry comes back as a UTC epoch whatever the server's local zone
+            self.assertAlmostEqual(store.load("live-sid")[1], time.time() + 60, delta=5)
+            store.delete("live-sid")
+
+
+if __name__ == "__main__":
+    unittest.main()
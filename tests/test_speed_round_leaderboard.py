@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from AjaSpellBApp import app
+from models import db, User, SpeedRoundScore, SpeedRoundLeaderboardEntry
+from score_outbox import ScoreOutbox
+import speed_round_leaderboard as lb
+
+
+class SpeedRoundLeaderboardTests(unittest.TestCase):
+    def setUp(self):
+        self.difficulty = "easy"
+        with app.app_context():
+            self.user_ids = []
+            for i in range(3):
+                user = User(username=f"lb_{os.urandom(4).hex()}", display_name=f"Racer {i}", role="student")
+                user.set_password("pw123456")
+                db.session.add(user)
+                db.session.commit()
+                self.user_ids.append(user.id)
+        lb.leaderboard_cache.invalidate()
+
+    def _drain(self, scores):
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = ScoreOutbox(poll_interval_ms=60000)
+            outbox.init_app(app, spool_path=os.path.join(tmp, "outbox.db"))
+            for user_id, points in scores:
+                outbox.enqueue_speed_round(user_id, {"words_attempted": 5, "words_correct": 5,
+                                                     "honey_points_earned": points,
+                                                     "difficulty_level": self.difficulty})
+            outbox.drain()
+
+    def test_outbox_keeps_each_players_best_and_ranks_them(self):
+        a, b, c = self.user_ids
+        self._drain([(a, 120), (b, 300), (a, 90), (c, 120), (a, 150)])
+        with app.app_context():
+            for period in lb.PERIODS:
+                board = lb.top(period, self.difficulty)
+                self.assertEqual([(e["user_id"], e["points"], e["rank"]) for e in board],
+                                 [(b, 300, 1), (a, 150, 2), (c, 120, 3)])
+            self.assertEqual(lb.rank_of(c, lb.WEEKLY, self.difficulty), {"rank": 3, "points": 120, "players": 3})
+            self.assertIsNone(lb.rank_of(c, lb.DAILY, "some_other_level"))
+
+    def test_ties_share_a_rank(self):
+        a, b, c = self.user_ids
+        self._drain([(a, 200), (b, 200), (c, 50)])
+        with app.app_context():
+            self.assertEqual([e["rank"] for e in lb.top(lb.ALL_TIME, self.difficulty)], [1, 1, 3])
+            self.assertEqual(lb.rank_of(b, lb.ALL_TIME, self.difficulty)["rank"], 1)
+            self.assertEqual(lb.rank_of(c, lb.ALL_TIME, self.difficulty)["rank"], 3)
+
+    def test_new_score_invalidates_cached_board(self):
+        a, b, _ = self.user_ids
+        self._drain([(a, 100)])
+        with app.app_context():
+            self.assertEqual(len(lb.cached_top(lb.DAILY, self.difficulty)), 1)
+            self.assertEqual(len(lb.cached_top(lb.DAILY, self.difficulty)), 1)
+        self.assertGreaterEqual(lb.leaderboard_cache.hits, 1)
+        self._drain([(b, 50)])
+        with app.app_context():
+            self.assertEqual(len(lb.cached_top(lb.DAILY, self.difficulty)), 2)
+
+    def test_rebuild_replaces_only_current_boards_of_its_difficulty(self):
+        a, b, _ = self.user_ids
+        now = datetime.utcnow()
+        with app.app_context():
+            db.session.add_all([
+                SpeedRoundScore(user_id=a, words_attempted=5, words_correct=5, total_time=30, honey_points_earned=400, difficulty_level=self.difficulty,
+                                completed_at=now - timedelta(days=60)),
+                SpeedRoundScore(user_id=b, words_attempted=5, words_correct=2, total_time=30, honey_points_earned=100, difficulty_level=self.difficulty,
+                                completed_at=now),
+            ])
+            db.session.commit()
+            # A past daily board must survive the rebuild of the current ones
+            db.session.add(SpeedRoundLeaderboardEntry(
+                period=lb.DAILY, period_key=lb.period_key(lb.DAILY, now - timedelta(days=3)),
+                difficulty_level=self.difficulty, user_id=a, best_points=70, achieved_at=now - timedelta(days=3)))
+            db.session.commit()
+            lb.rebuild(batch_size=1, now=now, difficulties=[self.difficulty])
+            self.assertEqual([e["user_id"] for e in lb.top(lb.ALL_TIME, self.difficulty, now=now)], [a, b])
+            self.assertEqual([e["user_id"] for e in lb.top(lb.DAILY, self.difficulty, now=now)], [b])
+            self.assertEqual(SpeedRoundLeaderboardEntry.query.filter_by(
+                difficulty_level=self.difficulty, period=lb.WEEKLY).count(), 1)
+            self.assertEqual(SpeedRoundLeaderboardEntry.query.filter_by(
+                difficulty_level=self.difficulty, period=lb.DAILY).count(), 2)
+
+    def test_endpoint_returns_board_and_my_rank(self):
+        a, b, _ = self.user_ids
+        self._drain([(a, 80), (b, 160)])
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(a)
+        resp = client.get(f"/api/speed-round/leaderboard?difficulty={self.difficulty}&period=daily")
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()
+        self.assertEqual([e["name"] for e in body["entries"]], ["Racer 1", "Racer 0"])
+        self.assertEqual(body["me"]["rank"], 2)
+        self.assertEqual(client.get("/api/speed-round/leaderboard?difficulty=x&period=monthly").status_code, 400)
+        self.assertEqual(client.get("/api/speed-round/leaderboard").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import time
+import unittest
+from unittest import mock
+
+from AjaSpellBApp import app
+
+# Per-request budget for /api/speed-round/next once prompts are prepared
+NEXT_BUDGET_MS = 50
+
+
+class SpeedRoundPromptTests(unittest.TestCase):
+    def _start(self, client, **config):
+        body = {"time_per_word": 10, "difficulty": "grade_3_4", "word_count": 15, "word_source": "auto"}
+        body.update(config)
+        resp = client.post("/api/speed-round/start", json=body)
+        self.assertEqual(resp.get_json()["status"], "success")
+
+    def test_prompts_resolved_at_start_without_network(self):
+        client = app.test_client()
+        with mock.patch("AjaSpellBApp.DICT_LOOKUP", side_effect=AssertionError("network lookup")):
+            self._start(client)
+        with client.session_transaction() as sess:
+            round_data = sess["speed_round"]
+            self.assertEqual(len(round_data["prompts"]), len(round_data["words"]))
+            self.assertTrue(all(p["definition"] for p in round_data["prompts"]))
+
+    def test_next_is_a_read_within_budget(self):
+        client = app.test_client()
+        self._start(client)
+        with mock.patch("AjaSpellBApp.get_word_info", side_effect=AssertionError("lookup while serving")):
+            for n in range(1, 6):
+                started = time.perf_counter()
+                data = client.get("/api/speed-round/next").get_json()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.assertEqual(data["current_index"], n)
+                self.assertLess(elapsed_ms, NEXT_BUDGET_MS)
+                client.post("/api/speed-round/answer", json={"user_input": data["word"], "elapsed_ms": 900})
+
+
+if __name__ == "__main__":
+    unittest.main()
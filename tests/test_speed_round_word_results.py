@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from AjaSpellBApp import app
+from migrate_speed_round_word_results import migrate_speed_round_word_results
+from models import db, User, SpeedRoundScore, SpeedRoundWordResult
+from score_outbox import ScoreOutbox
+
+DETAILS = [
+    {"word": "garden", "user_answer": "garden", "correct": True, "time_taken": 2.0, "points_earned": 20,
+     "speed_bonus": True},
+    {"word": "pencil", "user_answer": "pensil", "correct": False, "time_taken": 6.5, "points_earned": 0},
+    {"word": "rocket", "user_answer": "", "correct": False, "skipped": True, "time_taken": 0},
+]
+
+
+class SpeedRoundWordResultTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            user = User(username=f"words_{os.urandom(4).hex()}", display_name="Words", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def _rows(self):
+        return (SpeedRoundWordResult.query.filter_by(user_id=self.user_id)
+                .order_by(SpeedRoundWordResult.score_id, SpeedRoundWordResult.position).all())
+
+    def test_outbox_inserts_word_rows_with_the_score(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = ScoreOutbox(poll_interval_ms=60000)
+            outbox.init_app(app, spool_path=os.path.join(tmp, "outbox.db"))
+            outbox.enqueue_speed_round(self.user_id, {"words_attempted": 3, "words_correct": 1, "total_time": 9,
+                                                      "word_details": DETAILS, "difficulty_level": "grade_3_4"})
+            outbox.drain()
+        with app.app_context():
+            rows = self._rows()
+            self.assertEqual([(r.position, r.word, r.is_correct, r.skipped) for r in rows],
+                             [(1, "garden", True, False), (2, "pencil", False, False), (3, "rocket", False, True)])
+            score = SpeedRoundScore.query.filter_by(user_id=self.user_id).one()
+            self.assertTrue(all(r.score_id == score.id and r.completed_at == score.completed_at for r in rows))
+
+    def test_migration_backfills_legacy_scores_once(self):
+        with app.app_context():
+            for _ in range(3):
+                db.session.add(SpeedRoundScore(user_id=self.user_id, words_attempted=3, words_correct=1,
+                                               total_time=9, word_details=DETAILS, difficulty_level="grade_1_2",
+                                               completed_at=datetime(2025, 5, 1)))
+            db.session.commit()
+            migrate_speed_round_word_results(batch_size=2)
+            self.assertEqual(len(self._rows()), 9)
+            self.assertEqual(migrate_speed_round_word_results(batch_size=2)[1], 0)
+            self.assertEqual({r.difficulty_level for r in self._rows()}, {"grade_1_2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
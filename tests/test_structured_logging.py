@@ -0,0 +1,70 @@
+import io
+import json
+import logging
+import os
+import queue
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from AjaSpellBApp import app
+from structured_logging import (DroppingQueueHandler, LoggingSubsystem, SAMPLED, SamplingFilter,
+                                get_logger, VALID_REQUEST_ID)
+
+
+class StructuredLoggingTests(unittest.TestCase):
+    def test_request_id_is_echoed(self):
+        client = app.test_client()
+        resp = client.post("/api/next")
+        self.assertTrue(resp.headers.get("X-Request-ID"))
+        resp = client.post("/api/next", headers={"X-Request-ID": "abc123"})
+        self.assertEqual(resp.headers["X-Request-ID"], "abc123")
+        # Werkzeug refuses raw CR/LF in headers, so test the validator directly
+        for forged in ("abc\r\nINFO forged", "a" * 65, "id with spaces"):
+            self.assertIsNone(VALID_REQUEST_ID.fullmatch(forged))
+        resp = client.post("/api/next", headers={"X-Request-ID": "id with spaces"})
+        self.assertNotEqual(resp.headers["X-Request-ID"], "id with spaces")
+
+    def test_json_records_carry_request_id_and_levels(self):
+        stream = io.StringIO()
+        subsystem = LoggingSubsystem()
+        demo = Flask("demo")
+        log = get_logger("demo")
+
+        @demo.route("/")
+        def index():
+            log.info("served %s", "index")
+            log.debug("hidden")
+            return "ok"
+
+        root = logging.getLogger("beesmart")
+        saved = root.handlers[:], root.level
+        env = {"LOG_FORMAT": "json", "LOG_LEVEL": "INFO", "LOG_LEVELS": "demo=INFO"}
+        with mock.patch.dict(os.environ, env):
+            subsystem.init_app(demo, stream=stream)
+        try:
+            demo.test_client().get("/", headers={"X-Request-ID": "req-1"})
+        finally:
+            subsystem.stop()
+            root.handlers[:], root.level = saved
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([(l["msg"], l["request_id"], l["logger"]) for l in lines],
+                         [("served index", "req-1", "beesmart.demo")])
+
+    def test_sampling_and_dropping(self):
+        never = SamplingFilter(0.0)
+        sampled = logging.LogRecord("beesmart.quiz", logging.DEBUG, __file__, 1, "x", None, None)
+        sampled.__dict__.update(SAMPLED)
+        plain = logging.LogRecord("beesmart.quiz", logging.DEBUG, __file__, 1, "x", None, None)
+        self.assertFalse(never.filter(sampled))
+        self.assertTrue(never.filter(plain))
+
+        handler = DroppingQueueHandler(queue.Queue(1))
+        handler.emit(plain)
+        handler.emit(plain)
+        self.assertEqual(handler.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import io
+import json
+import time
+import unittest
+
+from AjaSpellBApp import app
+from upload_cache import UploadResultCache, upload_cache
+
+
+RECORDS = [{"word": "apple", "sentence": "An _____ a day.", "hint": ""}]
+
+
+class UploadResultCacheTests(unittest.TestCase):
+    def test_key_depends_on_bytes_versions_and_variant(self):
+        base = UploadResultCache.make_key(b"cat\ndog", "f1", "d1", ".txt")
+        self.assertEqual(base, UploadResultCache.make_key(b"cat\ndog", "f1", "d1", ".txt"))
+        self.assertNotEqual(base, UploadResultCache.make_key(b"cat\ndogs", "f1", "d1", ".txt"))
+        self.assertNotEqual(base, UploadResultCache.make_key(b"cat\ndog", "f2", "d1", ".txt"))
+        self.assertNotEqual(base, UploadResultCache.make_key(b"cat\ndog", "f1", "d2", ".txt"))
+        self.assertNotEqual(base, UploadResultCache.make_key(b"cat\ndog", "f1", "d1", ".csv"))
+
+    def test_get_returns_copy(self):
+        cache = UploadResultCache()
+        cache.put("k", RECORDS)
+        got = cache.get("k")
+        got[0]["word"] = "mutated"
+        self.assertEqual(cache.get("k")[0]["word"], "apple")
+
+    def test_entries_expire_by_age(self):
+        cache = UploadResultCache(ttl_seconds=0)
+        cache.put("k", RECORDS)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("k"))
+
+    def test_lru_eviction_by_entry_count(self):
+        cache = UploadResultCache(max_entries=2)
+        cache.put("a", RECORDS)
+        cache.put("b", RECORDS)
+        cache.get("a")  # 'b' is now least recently used
+        cache.put("c", RECORDS)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_eviction_by_total_size(self):
+        entry_size = len(json.dumps(RECORDS).encode("utf-8"))
+        cache = UploadResultCache(max_bytes=entry_size * 2)
+        for key in ("a", "b", "c"):
+            cache.put(key, RECORDS)
+        self.assertLessEqual(cache.stats()["bytes"], entry_size * 2)
+        self.assertIsNone(cache.get("a"))
+
+    def test_oversized_entry_is_not_cached(self):
+        cache = UploadResultCache(max_bytes=10)
+        self.assertFalse(cache.put("k", RECORDS))
+        self.assertIsNone(cache.get("k"))
+
+
+class UploadCacheEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        upload_cache.clear()
+
+    def _upload(self, content: bytes, name: str = "list.txt"):
+        return self.app.post(
+            "/api/upload",
+            data={"file": (io.BytesIO(content), name)},
+            content_type="multipart/form-data",
+        )
+
+    def test_repeat_upload_is_served_from_cache(self):
+        content = b"garden|A garden is full of flowers.\nbook|Books are for reading.\n"
+        first = json.loads(self._upload(content).data)
+        self.assertTrue(first.get("ok"))
+        self.assertFalse(first.get("cached", False))
+
+        second = json.loads(self._upload(content).data)
+        self.assertTrue(second.get("ok"))
+        self.assertTrue(second.get("cached"))
+        self.assertEqual(first["count"], second["count"])
+
+    def test_uploads_with_blocked_words_are_not_cached(self):
+        content = b"kill\nbook|Books are for reading.\n"
+        self._upload(content)
+        again = json.loads(self._upload(content).data)
+        self.assertFalse(again.get("cached", False))
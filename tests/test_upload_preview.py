@@ -0,0 +1,62 @@
+import io
+import json
+import time
+import unittest
+
+from AjaSpellBApp import app, UPLOAD_JOBS
+from upload_cache import upload_cache
+
+
+WORDS = ["garden", "pencil", "rocket", "button", "planet", "window", "basket",
+         "candle", "forest", "ladder", "marble", "pocket", "rabbit", "saddle", "tunnel"]
+
+
+class UploadPreviewTests(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        upload_cache.clear()
+
+    def _preview(self, lines, preview=5):
+        body = "\n".join(lines).encode("utf-8")
+        return self.client.post(
+            "/api/upload-preview",
+            data={"file": (io.BytesIO(body), "list.txt"), "preview": str(preview)},
+            content_type="multipart/form-data",
+        )
+
+    def _wait_for_job(self, job_id):
+        deadline = time.time() + 10
+        while UPLOAD_JOBS.get(job_id, {}).get("status") == "running" and time.time() < deadline:
+            time.sleep(0.02)
+
+    def test_preview_starts_quiz_and_job_fills_in_the_rest(self):
+        lines = [f"{w}|The {w} is here." for w in WORDS]
+        started = time.perf_counter()
+        resp = self._preview(lines)
+        elapsed = time.perf_counter() - started
+        data = json.loads(resp.data)
+
+        self.assertEqual(resp.status_code, 200, data)
+        self.assertTrue(data["pending"])
+        self.assertEqual([r["word"] for r in data["preview"]], WORDS[:5])
+        self.assertLess(elapsed, 0.5)
+
+        question = json.loads(self.client.post("/api/next").data)
+        self.assertIn("sentence", question)
+
+        self._wait_for_job(data["job_id"])
+        wb = json.loads(self.client.get("/api/wordbank").data)
+        self.assertEqual(wb["count"], len(WORDS))
+        self.assertEqual([r["word"] for r in wb["words"][:5]], WORDS[:5])
+
+        with self.client.session_transaction() as sess:
+            self.assertEqual(len(sess["quiz_state_v1"]["order"]), len(WORDS))
+
+    def test_preview_skips_blocked_words(self):
+        data = json.loads(self._preview(["kill", "garden|A garden grows.", "pencil|Write with a pencil."]).data)
+        self.assertEqual([r["word"] for r in data["preview"]], ["garden", "pencil"])
+        self._wait_for_job(data["job_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
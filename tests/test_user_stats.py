@@ -0,0 +1,83 @@
+import os
+import unittest
+
+from sqlalchemy import text
+
+from AjaSpellBApp import app
+from models import db, User, UserStats, QuizSession
+
+
+class UserStatsTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            user = User(username=f"stats_{os.urandom(4).hex()}", display_name="Stats Test", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def _complete(self, user, correct, total=10, streak=0):
+        quiz = QuizSession(user_id=user.id, total_words=total, correct_count=correct,
+                           incorrect_count=total - correct, max_streak=streak)
+        db.session.add(quiz)
+        quiz.complete_session()
+        db.session.flush()
+        return quiz
+
+    def test_incremental_matches_full_recompute(self):
+        with app.app_context():
+            user = db.session.get(User, self.user_id)
+            for correct, streak in ((10, 10), (8, 3), (5, 2)):
+                user.record_completed_session(self._complete(user, correct, streak=streak))
+            db.session.commit()
+            incremental = (float(user.cumulative_gpa), float(user.average_accuracy), user.best_grade, user.best_streak)
+            self.assertEqual(incremental, (round((4.0 + 2.7 + 0.0) / 3, 2), round(230 / 3, 2), "A+", 10))
+
+            user.update_gpa_and_accuracy()
+            self.assertEqual((float(user.cumulative_gpa), float(user.average_accuracy), user.best_grade,
+                              user.best_streak), incremental)
+
+    def test_concurrent_completions_are_not_lost(self):
+        with app.app_context():
+            user = db.session.get(User, self.user_id)
+            user.record_completed_session(self._complete(user, 10))
+            db.session.commit()
+            stale = UserStats.for_user(user.id, create=False)
+            self.assertEqual(stale.completed_sessions, 1)
+            # Another worker folds in a B (3.0, 80%) after this one read the row
+            with db.engine.begin() as conn:
+                conn.execute(text("UPDATE user_stats SET completed_sessions = completed_sessions + 1,"
+                                  " graded_sessions = graded_sessions + 1, gpa_points_total = gpa_points_total + 3.0,"
+                                  " accuracy_total = accuracy_total + 80 WHERE user_id = :u"), {"u": user.id})
+            user.record_completed_session(self._complete(user, 0))
+            db.session.commit()
+            stats = UserStats.for_user(user.id, create=False)
+            self.assertEqual((stats.completed_sessions, stats.graded_sessions), (3, 3))
+            self.assertEqual((float(user.cumulative_gpa), float(user.average_accuracy)),
+                             (round(7.0 / 3, 2), 60.0))
+
+    def test_failing_grades_leave_best_grade_unset(self):
+        with app.app_context():
+            user = db.session.get(User, self.user_id)
+            self._complete(user, 0)
+            db.session.commit()
+            user.record_completed_session(self._complete(user, 1))
+            db.session.commit()
+            self.assertIsNone(user.best_grade)
+            self.assertIsNone(UserStats.for_user(user.id, create=False).best_grade)
+
+    def test_first_completion_builds_from_existing_history(self):
+        with app.app_context():
+            user = db.session.get(User, self.user_id)
+            self._complete(user, 9)  # completed before aggregates existed
+            db.session.commit()
+            self.assertIsNone(UserStats.for_user(user.id, create=False))
+            user.record_completed_session(self._complete(user, 7))
+            db.session.commit()
+            stats = UserStats.for_user(user.id, create=False)
+            self.assertEqual((stats.completed_sessions, stats.graded_sessions), (2, 2))
+            self.assertEqual(user.best_grade, "A-")
+
+
+if __name__ == "__main__":
+    unittest.main()
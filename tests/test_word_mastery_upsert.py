@@ -0,0 +1,72 @@
+import os
+import unittest
+
+from AjaSpellBApp import app
+from models import db, User, WordMastery
+
+
+class WordMasteryUpsertTests(unittest.TestCase):
+    def setUp(self):
+        with app.app_context():
+            user = User(username=f"mastery_{os.urandom(4).hex()}", display_name="Mastery Test", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def _row(self, word):
+        return WordMastery.query.filter_by(user_id=self.user_id, word=word).one()
+
+    def test_bulk_attempts_fold_into_one_row_per_word(self):
+        with app.app_context():
+            touched = WordMastery.record_attempts([
+                (self.user_id, "garden", True, 2.0),
+                (self.user_id, "garden", False, 4.0),
+                (self.user_id, "pencil", True, None),
+            ])
+            db.session.commit()
+            self.assertEqual(touched, 2)
+            garden = self._row("garden")
+            self.assertEqual((garden.times_seen, garden.times_correct, garden.times_incorrect), (2, 1, 1))
+            self.assertEqual(float(garden.success_rate), 50.0)
+            self.assertEqual(garden.mastery_level, "practicing")
+            self.assertTrue(garden.needs_review)
+            self.assertEqual(float(garden.average_time_seconds), 3.0)
+            self.assertEqual(float(garden.fastest_time_seconds), 2.0)
+            self.assertIsNone(self._row("pencil").average_time_seconds)
+
+    def test_conflicting_attempts_update_in_sql(self):
+        with app.app_context():
+            WordMastery.record_attempts([(self.user_id, "rocket", False, 6.0)])
+            db.session.commit()
+            WordMastery.record_attempts([(self.user_id, "rocket", True, 3.0)] * 19)
+            db.session.commit()
+            rocket = self._row("rocket")
+            self.assertEqual((rocket.times_seen, rocket.times_correct), (20, 19))
+            self.assertEqual(float(rocket.success_rate), 95.0)
+            self.assertEqual(rocket.mastery_level, "mastered")
+            self.assertFalse(rocket.needs_review)
+            self.assertAlmostEqual(float(rocket.average_time_seconds), 3.15, places=2)
+            self.assertEqual(float(rocket.fastest_time_seconds), 3.0)
+
+    def test_update_stats_uses_the_shared_thresholds(self):
+        for correct, seen, expected in ((19, 20, ("mastered", False)), (4, 5, ("proficient", False)),
+                                        (2, 3, ("practicing", True)), (7, 10, ("practicing", False)),
+                                        (1, 3, ("learning", True))):
+            row = WordMastery(times_seen=seen - 1, times_correct=correct - 1, times_incorrect=seen - correct)
+            row.update_stats(True)
+            self.assertEqual((row.mastery_level, row.needs_review), expected)
+            self.assertEqual(WordMastery.mastery_for(row.success_rate), expected)
+
+    def test_statement_compiles_for_postgres(self):
+        from sqlalchemy.dialects import postgresql
+        rows = [{"user_id": 1, "word": "x", "times_seen": 1, "times_correct": 1, "times_incorrect": 0,
+                 "success_rate": 100.0, "mastery_level": "mastered", "needs_review": False,
+                 "average_time_seconds": None, "fastest_time_seconds": None}]
+        sql = str(WordMastery.upsert_statement(rows, "postgresql").compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (user_id, word) DO UPDATE", sql)
+        self.assertIn("100.0", sql)
+        self.assertIsNone(WordMastery.upsert_statement(rows, "mysql"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import unittest
+
+from AjaSpellBApp import app, RECENT_WORDS_KEY
+from models import db, User
+from word_generator import DIFFICULTY_POOLS, RECENT_ROUNDS, RecentWords, sample_fresh
+
+
+class WordSamplerTests(unittest.TestCase):
+    def test_sample_fresh_avoids_recent_then_repeats(self):
+        pool = tuple(f"w{i}" for i in range(30))
+        avoid = {f"w{i}" for i in range(20)}
+        picked = sample_fresh(pool, 10, avoid)
+        self.assertEqual(sorted(picked), sorted(set(pool) - avoid))
+        self.assertEqual(len(sample_fresh(pool, 15, avoid)), 15)
+        self.assertEqual(len(sample_fresh(pool, 15, avoid, allow_repeats=False)), 10)
+
+    def test_recent_words_keeps_last_rounds(self):
+        recent = RecentWords()
+        for n in range(RECENT_ROUNDS + 2):
+            recent.add_round([f"Round{n}"])
+        self.assertEqual(recent.words(), {f"round{n}" for n in range(2, RECENT_ROUNDS + 2)})
+        self.assertEqual(RecentWords(recent.to_json()).words(), recent.words())
+
+    def _start(self, client, count=20):
+        client.post("/api/speed-round/start", json={"difficulty": "grade_3_4", "word_count": count,
+                                                    "word_source": "auto"})
+        with client.session_transaction() as sess:
+            return sess["speed_round"]["words"]
+
+    def test_consecutive_speed_rounds_do_not_repeat(self):
+        client = app.test_client()
+        self.assertGreaterEqual(len(DIFFICULTY_POOLS["grade_3_4"]), 20 * RECENT_ROUNDS)
+        seen = set()
+        for _ in range(RECENT_ROUNDS):
+            words = {w.lower() for w in self._start(client)}
+            self.assertFalse(words & seen)
+            seen |= words
+
+    def test_signed_in_history_persists_on_user(self):
+        with app.app_context():
+            user = User(username=f"sampler_{os.urandom(4).hex()}", display_name="Sampler", role="student")
+            user.set_password("pw123456")
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+        words = self._start(client, count=5)
+        with app.app_context():
+            history = db.session.get(User, user_id).preferences[RECENT_WORDS_KEY]
+        self.assertEqual(history, [[w.lower() for w in words]])
+
+
+if __name__ == "__main__":
+    unittest.main()
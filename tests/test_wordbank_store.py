@@ -0,0 +1,81 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from AjaSpellBApp import app, compile_question
+from models import db, SharedWordbank
+from wordbank_store import FrozenRecord, WordbankStore, wordbank_store
+
+
+RECORDS = [{"word": "garden", "sentence": "A _____ grows.", "hint": ""},
+           {"word": "pencil", "sentence": "Write with a _____.", "hint": "school"}]
+
+
+class WordbankStoreTests(unittest.TestCase):
+    def test_same_contents_share_one_ref_and_object(self):
+        with app.app_context():
+            ref = wordbank_store.put(RECORDS)
+            padded = [dict(r, word=f"  {r['word']} ") for r in RECORDS]
+            self.assertEqual(wordbank_store.put(padded), ref)
+            self.assertEqual(len(ref), 64)
+            self.assertIs(wordbank_store.get(ref), wordbank_store.get(ref))
+            self.assertNotEqual(wordbank_store.put(RECORDS[:1]), ref)
+
+    def test_records_are_immutable(self):
+        with app.app_context():
+            records = wordbank_store.get(wordbank_store.put(RECORDS))
+        with self.assertRaises(TypeError):
+            records[0]["word"] = "changed"
+        self.assertEqual(json.loads(json.dumps(records))[0]["word"], "garden")
+
+    def test_refs_survive_a_cold_cache(self):
+        with app.app_context():
+            ref = wordbank_store.put(RECORDS)
+            cold = WordbankStore(db, SharedWordbank)
+            self.assertEqual([dict(r) for r in cold.get(ref)], RECORDS)
+            self.assertIsNone(cold.get("0" * 64))
+
+    def test_definitions_are_kept_without_changing_other_refs(self):
+        with app.app_context():
+            plain = wordbank_store.put(RECORDS)
+            self.assertEqual(wordbank_store.put([dict(r, definition=" ") for r in RECORDS]), plain)
+            defined = [{"word": "orbit", "sentence": "", "hint": "", "definition": "A path around a star."}]
+            records = wordbank_store.get(wordbank_store.put(defined))
+            self.assertEqual(records[0]["definition"], "A path around a star.")
+            self.assertEqual(compile_question(records[0])["definition_source"], "definition_field")
+
+    def test_unused_wordbanks_are_swept(self):
+        store = WordbankStore(db, SharedWordbank, retention_days=30)
+        t = SharedWordbank.__table__
+        with app.app_context():
+            stale = store.put([{"word": "fossil", "sentence": "An old _____.", "hint": ""}])
+            fresh = store.put([{"word": "sprout", "sentence": "A new _____.", "hint": ""}])
+            long_ago = datetime.utcnow() - timedelta(days=60)
+            with db.engine.begin() as conn:
+                conn.execute(t.update().where(t.c.ref.in_([stale, fresh]))
+                             .values(created_at=long_ago, last_used_at=long_ago))
+
+            # Loading a wordbank keeps it alive, even from the LRU
+            store._touched.clear()
+            self.assertIsNotNone(store.get(fresh))
+            self.assertGreaterEqual(store.purge_unused(), 1)
+
+            cold = WordbankStore(db, SharedWordbank)
+            self.assertIsNone(cold.get(stale))
+            self.assertIsNotNone(cold.get(fresh))
+            self.assertIsNone(store.get(stale))
+
+    def test_sessions_on_the_same_list_share_the_wordbank(self):
+        refs = []
+        for _ in range(2):
+            client = app.test_client()
+            client.post("/api/upload", json={"words": RECORDS})
+            with client.session_transaction() as sess:
+                self.assertNotIn("wordbank_v1", sess)
+                refs.append(sess["wordbank_ref"])
+        self.assertEqual(refs[0], refs[1])
+        self.assertIsInstance(wordbank_store.get(refs[0])[0], FrozenRecord)
+
+
+if __name__ == "__main__":
+    unittest.main()
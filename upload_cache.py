@@ -0,0 +1,120 @@
+"""
+BeeSmart Spelling App - Upload Result Cache
+Content-hash cache of parsed, filtered and enriched upload results.
+
+Teachers re-upload the same CSV/PDF/photo week after week and whole classes
+upload identical lists. Keying on the SHA-256 of the uploaded bytes (plus the
+content-filter and dictionary snapshot versions) lets a repeat upload skip
+parsing, OCR, filtering and dictionary enrichment entirely.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class UploadResultCache:
+    """Thread-safe LRU cache with size- and age-based eviction.
+
+    Entries store the final enriched record list for an upload. Reads return
+    deep copies so callers can never mutate a cached list in place.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024,
+                 ttl_seconds: int = 24 * 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content: Optional[bytes], filter_version: str, dictionary_version: str, variant: str = "",
+                 digest: Optional[str] = None) -> str:
+        """Build a cache key from the raw upload bytes and the pipeline versions.
+
+        `variant` distinguishes inputs whose bytes parse differently (e.g. the
+        file extension), so a .txt and a .csv with identical bytes don't collide.
+        Pass `digest` (the SHA-256 hex of the bytes) instead of `content` when
+        the upload was hashed while streaming it from disk.
+        """
+        if digest is None:
+            digest = hashlib.sha256(content or b"").hexdigest()
+        return f"{digest}:{variant}:{filter_version}:{dictionary_version}"
+
+    def get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """Return a copy of the cached records for `key`, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry["stored_at"] > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            records = entry["records"]
+        return copy.deepcopy(records)
+
+    def put(self, key: str, records: List[Dict[str, str]]) -> bool:
+        """Store records under `key`. Returns False if the entry is too large to cache."""
+        try:
+            size = len(json.dumps(records, ensure_ascii=False).encode("utf-8"))
+        except (TypeError, ValueError):
+            return False
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                "records": copy.deepcopy(records),
+                "size": size,
+                "stored_at": time.time(),
+            }
+            self._total_bytes += size
+            self._evict()
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry["size"]
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used ones until within limits."""
+        now = time.time()
+        expired = [k for k, e in self._entries.items() if now - e["stored_at"] > self.ttl_seconds]
+        for key in expired:
+            self._remove(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+
+# Global instance
+upload_cache = UploadResultCache()
@@ -1,9 +1,14 @@
 """
 BeeSmart Spelling App - Word Generation System
 Auto-generates spelling words by difficulty level for speed rounds
+
+Words are drawn without replacement from deduplicated pools built once at
+import, avoiding each student's recently seen words (RecentWords) so
+consecutive rounds don't repeat until a pool runs out.
 """
 
 import random
+from typing import Iterable, List, Optional, Sequence, Set
 
 # Grade 1-2: CVC words, basic sight words
 GRADE_1_2_WORDS = [
@@ -93,6 +98,75 @@ HIGH_SCHOOL_WORDS = [
 ]
 
 
+# Previous rounds whose words a student shouldn't see again right away
+RECENT_ROUNDS = 3
+
+
+def _pool(*lists) -> tuple:
+    """Deduplicated (case-insensitively, first spelling wins) word pool."""
+    seen = {}
+    for words in lists:
+        for w in words:
+            seen.setdefault(w.lower(), w)
+    return tuple(seen.values())
+
+
+# Precomputed pools: sampling never copies or filters a whole list
+DIFFICULTY_POOLS = {
+    'grade_1_2': _pool(GRADE_1_2_WORDS),
+    'grade_3_4': _pool(GRADE_3_4_WORDS),
+    'grade_5_6': _pool(GRADE_5_6_WORDS),
+    'grade_7_8': _pool(MIDDLE_SCHOOL_WORDS),  # Map grade_7_8 to middle school
+    'middle_school': _pool(MIDDLE_SCHOOL_WORDS),
+    'high_school': _pool(HIGH_SCHOOL_WORDS)
+}
+MIXED_POOL = _pool(GRADE_1_2_WORDS, GRADE_3_4_WORDS, GRADE_5_6_WORDS, MIDDLE_SCHOOL_WORDS, HIGH_SCHOOL_WORDS)
+
+
+def sample_fresh(pool: Sequence[str], count: int, avoid: Optional[Set[str]] = None,
+                 allow_repeats: bool = True) -> List[str]:
+    """
+    Draw up to `count` distinct words from `pool`, skipping words in `avoid`
+    (lowercase). Samples count + len(avoid) positions, so it is O(count +
+    len(avoid)) regardless of pool size and still finds `count` fresh words
+    whenever the pool has them. With allow_repeats, avoided words fill the
+    gap when the pool runs out of fresh ones.
+    """
+    avoid = avoid or set()
+    n = len(pool)
+    fresh, stale = [], []
+    for i in random.sample(range(n), min(n, count + len(avoid))):
+        word = pool[i]
+        (stale if word.lower() in avoid else fresh).append(word)
+        if len(fresh) == count:
+            break
+    if allow_repeats and len(fresh) < count:
+        fresh.extend(stale[:count - len(fresh)])
+    return fresh
+
+
+class RecentWords:
+    """A student's words from their last `rounds` rounds, oldest round first.
+
+    Stored as a short list of lowercase word lists (JSON-able), so it fits in
+    User.preferences or the session.
+    """
+
+    def __init__(self, history: Optional[Iterable[Iterable[str]]] = None, rounds: int = RECENT_ROUNDS):
+        self.rounds = rounds
+        self.history = [[w.lower() for w in r] for r in (history or [])][-rounds:] if rounds else []
+
+    def words(self) -> Set[str]:
+        return {w for r in self.history for w in r}
+
+    def add_round(self, words: Iterable[str]):
+        if self.rounds:
+            self.history = (self.history + [[w.lower() for w in words]])[-self.rounds:]
+
+    def to_json(self) -> List[List[str]]:
+        return self.history
+
+
 def generate_words_by_difficulty(difficulty_level, count=20, exclude_words=None):
     """
     Generate a list of words for the specified difficulty level
@@ -101,36 +175,14 @@ def generate_words_by_difficulty(difficulty_level, count=20, exclude_words=None)
         difficulty_level (str): One of 'grade_1_2', 'grade_3_4', 'grade_5_6', 
                                'grade_7_8', 'middle_school', 'high_school'
         count (int): Number of words to generate
-        exclude_words (list): Words to exclude from selection
+        exclude_words (iterable): Words to avoid (e.g. RecentWords.words());
+                                  reused only if the pool runs out
     
     Returns:
         list: List of word strings
     """
-    word_pools = {
-        'grade_1_2': GRADE_1_2_WORDS,
-        'grade_3_4': GRADE_3_4_WORDS,
-        'grade_5_6': GRADE_5_6_WORDS,
-        'grade_7_8': MIDDLE_SCHOOL_WORDS,  # Map grade_7_8 to middle school
-        'middle_school': MIDDLE_SCHOOL_WORDS,
-        'high_school': HIGH_SCHOOL_WORDS
-    }
-    
-    if difficulty_level not in word_pools:
-        difficulty_level = 'grade_3_4'  # Default fallback
-    
-    word_pool = word_pools[difficulty_level].copy()
-    
-    # Remove excluded words
-    if exclude_words:
-        word_pool = [w for w in word_pool if w.lower() not in [e.lower() for e in exclude_words]]
-    
-    # If not enough words, return what we have
-    if len(word_pool) <= count:
-        random.shuffle(word_pool)
-        return word_pool
-    
-    # Randomly select words
-    return random.sample(word_pool, count)
+    pool = DIFFICULTY_POOLS.get(difficulty_level, DIFFICULTY_POOLS['grade_3_4'])  # Default fallback
+    return sample_fresh(pool, count, {e.lower() for e in exclude_words or ()})
 
 
 def get_difficulty_multiplier(difficulty_level):
@@ -165,23 +217,12 @@ def generate_mixed_words(count=20, exclude_words=None):
     
     Args:
         count (int): Number of words to generate
-        exclude_words (list): Words to exclude from selection
+        exclude_words (iterable): Words to avoid; reused only if the pool runs out
     
     Returns:
         list: List of word strings from various difficulty levels
     """
-    all_words = (
-        GRADE_1_2_WORDS + 
-        GRADE_3_4_WORDS + 
-        GRADE_5_6_WORDS + 
-        MIDDLE_SCHOOL_WORDS + 
-        HIGH_SCHOOL_WORDS
-    )
-    
-    if exclude_words:
-        all_words = [w for w in all_words if w.lower() not in [e.lower() for e in exclude_words]]
-    
-    return random.sample(all_words, min(count, len(all_words)))
+    return sample_fresh(MIXED_POOL, count, {e.lower() for e in exclude_words or ()})
 
 
 # Test function
@@ -0,0 +1,269 @@
+"""
+BeeSmart Spelling App - Shared Wordbank Store
+Content-addressed, immutable wordbank storage shared across sessions.
+
+A wordbank is stored once under the SHA-256 of its normalized records and the
+session only keeps that 64-character ref. When a class loads the same saved
+list or joins the same battle, every student resolves the ref to the same
+frozen in-memory tuple through a process-wide LRU instead of carrying a
+private copy.
+
+Rows are content-addressed and shared, so nothing owns them. Instead each
+row carries last_used_at, bumped by put() and get() at most once per
+TOUCH_INTERVAL_SECONDS per ref and process, and rows unused for
+RETENTION_DAYS are deleted by purge_unused() (run at most every
+PURGE_INTERVAL_SECONDS per process on put). The retention window is far
+longer than a session lives, so any ref still held by a session is kept;
+a session whose ref was swept falls back like any unknown ref.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import exc as sa_exc, func
+
+from models import db, SharedWordbank
+
+# Delete stored wordbanks nobody has loaded for this long
+RETENTION_DAYS = 30
+
+# Refresh a ref's last_used_at at most this often (per process)
+TOUCH_INTERVAL_SECONDS = 3600
+
+# How often (per process) put() sweeps unused wordbanks
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class FrozenRecord(dict):
+    """Read-only word record. Still a dict, so it serializes with jsonify."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("shared wordbank records are immutable; copy with dict(record)")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+def normalize_records(records: Iterable[Dict[str, str]]) -> Tuple[FrozenRecord, ...]:
+    """Canonical word/sentence/hint (and definition, when given) records, frozen.
+
+    An empty definition is left out entirely, so lists without definitions
+    keep the refs they had before definitions were stored.
+    """
+    normalized = []
+    for r in records:
+        record = {
+            "word": (r.get("word") or "").strip(),
+            "sentence": (r.get("sentence") or "").strip(),
+            "hint": (r.get("hint") or "").strip(),
+        }
+        definition = (r.get("definition") or "").strip()
+        if definition:
+            record["definition"] = definition
+        normalized.append(FrozenRecord(record))
+    return tuple(normalized)
+
+
+def wordbank_ref(records: Tuple[FrozenRecord, ...]) -> str:
+    """SHA-256 of the canonical JSON encoding of normalized records."""
+    canonical = json.dumps(records, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WordbankStore:
+    """Durable table of wordbanks by ref, fronted by a thread-safe LRU.
+
+    Row contents are written once and never updated, so cached entries never
+    go stale and need no invalidation; only last_used_at moves. Pinned
+    wordbanks (the built-in default sets) live outside the LRU and never
+    touch the database.
+    """
+
+    def __init__(self, db, model, max_entries: int = 128,
+                 retention_days: float = RETENTION_DAYS,
+                 touch_interval_seconds: float = TOUCH_INTERVAL_SECONDS,
+                 purge_interval_seconds: float = PURGE_INTERVAL_SECONDS):
+        self.db = db
+        self.table = model.__table__
+        self.max_entries = max_entries
+        self.retention_days = retention_days
+        self.touch_interval = touch_interval_seconds
+        self.purge_interval = purge_interval_seconds
+        self._touched: Dict[str, float] = {}
+        self._next_purge = 0.0
+        self._cache: "OrderedDict[str, Tuple[FrozenRecord, ...]]" = OrderedDict()
+        self._questions: "OrderedDict[str, Tuple[FrozenRecord, ...]]" = OrderedDict()
+        self._pinned: Dict[str, Tuple[FrozenRecord, ...]] = {}
+        self._pinned_questions: Dict[str, Tuple[FrozenRecord, ...]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _touch(self, ref: str, stored: bool = False):
+        """Bump last_used_at for ref unless this process did so recently."""
+        now = time.monotonic()
+        with self._lock:
+            if not stored and self._touched.get(ref, 0.0) > now:
+                return
+            self._touched[ref] = now + self.touch_interval
+            if len(self._touched) > self.max_entries * 4:
+                self._touched = {k: v for k, v in self._touched.items() if v > now}
+        if stored:
+            return  # the insert just set it
+        t = self.table
+        try:
+            with self.db.engine.begin() as conn:
+                conn.execute(t.update().where(t.c.ref == ref).values(last_used_at=datetime.utcnow()))
+        except Exception as e:
+            print(f"⚠️ Wordbank touch failed: {e}")
+
+    def _maybe_purge(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        try:
+            removed = self.purge_unused()
+            if removed:
+                print(f"🧹 Removed {removed} unused shared wordbanks")
+        except Exception as e:
+            print(f"⚠️ Wordbank purge failed: {e}")
+
+    def purge_unused(self, now: Optional[datetime] = None) -> int:
+        """Delete wordbanks not used within the retention window. Returns rows removed."""
+        t = self.table
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+        with self.db.engine.begin() as conn:
+            removed = conn.execute(
+                t.delete().where(func.coalesce(t.c.last_used_at, t.c.created_at) < cutoff)
+            ).rowcount or 0
+        if removed:
+            # Swept refs must not linger in this process's LRU either
+            self.clear_cache()
+        return removed
+
+    def _remember(self, ref: str, records: Tuple[FrozenRecord, ...]) -> Tuple[FrozenRecord, ...]:
+        with self._lock:
+            existing = self._cache.get(ref)
+            if existing is not None:
+                self._cache.move_to_end(ref)
+                return existing
+            self._cache[ref] = records
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return records
+
+    def put(self, records: Iterable[Dict[str, str]]) -> str:
+        """Store a wordbank (if new) and return its ref."""
+        frozen = normalize_records(records)
+        ref = wordbank_ref(frozen)
+        with self._lock:
+            cached = ref in self._cache
+            if cached:
+                self._cache.move_to_end(ref)
+        if cached:
+            self._touch(ref)
+            return ref
+
+        t = self.table
+        inserted = False
+        with self.db.engine.begin() as conn:
+            exists = conn.execute(t.select().with_only_columns(t.c.ref).where(t.c.ref == ref)).first()
+            if exists is None:
+                now = datetime.utcnow()
+                try:
+                    conn.execute(t.insert().values(
+                        ref=ref, records=[dict(r) for r in frozen],
+                        word_count=len(frozen), created_at=now, last_used_at=now))
+                    inserted = True
+                except sa_exc.IntegrityError:
+                    pass  # stored concurrently by another worker; contents are identical
+        self._touch(ref, stored=inserted)
+        self._remember(ref, frozen)
+        self._maybe_purge()
+        return ref
+
+    def pin(self, records: Iterable[Dict[str, str]]) -> str:
+        """Hold a process-wide wordbank in memory for good and return its ref."""
+        frozen = normalize_records(records)
+        ref = wordbank_ref(frozen)
+        with self._lock:
+            self._pinned.setdefault(ref, frozen)
+        return ref
+
+    def get(self, ref: str) -> Optional[Tuple[FrozenRecord, ...]]:
+        """Resolve a ref to its shared frozen records, or None if unknown."""
+        with self._lock:
+            records = self._pinned.get(ref)
+            if records is not None:
+                self.hits += 1
+                return records
+            records = self._cache.get(ref)
+            if records is not None:
+                self._cache.move_to_end(ref)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if records is not None:
+            self._touch(ref)
+            return records
+
+        t = self.table
+        with self.db.engine.connect() as conn:
+            row = conn.execute(t.select().with_only_columns(t.c.records).where(t.c.ref == ref)).first()
+        if row is None:
+            return None
+        self._touch(ref)
+        return self._remember(ref, normalize_records(row.records or []))
+
+    def questions(self, ref: str, compile_question: Callable[[Dict[str, str]], Dict]) -> Optional[Tuple[FrozenRecord, ...]]:
+        """Per-word question payloads for a wordbank, compiled once per ref.
+
+        Payloads depend only on the (immutable) records, so every session on
+        the same wordbank shares one compiled tuple.
+        """
+        with self._lock:
+            compiled = self._pinned_questions.get(ref)
+            if compiled is not None:
+                return compiled
+            compiled = self._questions.get(ref)
+            if compiled is not None:
+                self._questions.move_to_end(ref)
+                return compiled
+
+        records = self.get(ref)
+        if records is None:
+            return None
+        compiled = tuple(FrozenRecord(compile_question(r)) for r in records)
+        with self._lock:
+            if ref in self._pinned:
+                self._pinned_questions[ref] = compiled
+                return compiled
+            self._questions[ref] = compiled
+            while len(self._questions) > self.max_entries:
+                self._questions.popitem(last=False)
+        return compiled
+
+    def clear_cache(self):
+        """Drop LRU entries; pinned wordbanks stay."""
+        with self._lock:
+            self._cache.clear()
+            self._questions.clear()
+            self._touched.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "pinned": len(self._pinned), "hits": self.hits, "misses": self.misses}
+
+
+# Global instance
+wordbank_store = WordbankStore(db, SharedWordbank)